@@ -6,18 +6,26 @@ from .app import app
 from .config import settings
 from .services import (
     LLMService,
+    get_llm,
     OCRService,
     NormalizerService,
+    BatchingNormalizer,
     ValidatorService,
-    SummarizerService
+    SummarizerService,
+    LowConfidenceError,
+    ValidationResponseError
 )
 
 __all__ = [
     'app',
     'settings',
     'LLMService',
+    'get_llm',
     'OCRService', 
     'NormalizerService',
+    'BatchingNormalizer',
     'ValidatorService',
-    'SummarizerService'
+    'SummarizerService',
+    'LowConfidenceError',
+    'ValidationResponseError'
 ]
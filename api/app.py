@@ -3,17 +3,25 @@ AI-Powered Medical Report Simplifier - Complete Application
 All-in-one FastAPI app with models, routes, and main logic.
 """
 
+import asyncio
 import logging
+import os
 from fastapi import FastAPI, APIRouter, UploadFile, File, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, Field, TypeAdapter
 from typing import List, Optional, Dict, Any
 from .config import settings
 from .services import (
+    WORKER_PROCESSES_ENV,
     OCRService,
     NormalizerService,
+    BatchingNormalizer,
     ValidatorService,
-    SummarizerService
+    SummarizerService,
+    LowConfidenceError,
+    get_llm,
+    llm_cache
 )
 
 # Configure logging
@@ -94,6 +102,10 @@ class ValidationResponse(BaseModel):
     reason: Optional[str] = Field(None, description="Reason if validation failed")
     confidence: float = Field(..., ge=0.0, le=1.0, description="Validation confidence")
 
+# Built once at import so per-request validation skips schema construction
+tests_adapter = TypeAdapter(List[Test])
+explanations_adapter = TypeAdapter(List[Explanation])
+
 # ============================================================================
 # FASTAPI APPLICATION
 # ============================================================================
@@ -104,7 +116,8 @@ app = FastAPI(
     description="Backend service for extracting, normalizing, and simplifying medical reports",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
@@ -119,6 +132,7 @@ app.add_middleware(
 # Initialize services
 ocr_service = OCRService()
 normalizer_service = NormalizerService()
+normalizer_batcher = BatchingNormalizer(normalizer_service)
 validator_service = ValidatorService()
 summarizer_service = SummarizerService()
 
@@ -141,7 +155,7 @@ async def root():
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
-    return {"status": "healthy"}
+    return {"status": "healthy", "cache": llm_cache.stats}
 
 
 @app.post("/process/file")
@@ -156,31 +170,44 @@ async def process_file_report(file: UploadFile = File(...)):
         FinalResponse or ErrorResponse
     """
     try:
-        logger.info(f"File processing pipeline started for file: {file.filename}")
+        logger.info("File processing pipeline started for file: %s", file.filename)
         
-        # Read file content
-        file_bytes = await file.read()
+        # Use the upload's spooled temp file directly (Starlette spools large
+        # uploads to disk) instead of materializing the whole body in memory
+        await file.seek(0)
+        upload = file.file
         
         # Check if it's a text file
         if file.content_type == "text/plain" or file.filename.endswith('.txt'):
             # For text files, read content directly
             logger.info("Processing text file...")
-            raw_text = file_bytes.decode('utf-8')
-            logger.info(f"Extracted text content ({len(raw_text)} characters)")
+            raw_text = (await asyncio.to_thread(upload.read)).decode('utf-8')
+            logger.info("Extracted text content (%d characters)", len(raw_text))
             
         elif file.content_type.startswith('image/') or file.content_type == 'application/pdf':
             # For image/PDF files, use OCR
             logger.info("Processing image/PDF file with OCR...")
             
-            if file.content_type.startswith('image/'):
-                ocr_result = ocr_service.extract_from_image(file_bytes)
-            else:  # PDF
-                ocr_result = ocr_service.extract_from_pdf(file_bytes)
+            try:
+                # OCR is CPU/subprocess bound; keep it off the event loop
+                if file.content_type.startswith('image/'):
+                    ocr_result = await asyncio.to_thread(ocr_service.extract_from_image, upload)
+                else:  # PDF
+                    ocr_result = await asyncio.to_thread(
+                        ocr_service.extract_from_pdf,
+                        upload,
+                        early_abort_threshold=settings.OCR_MIN_CONFIDENCE
+                    )
+            except LowConfidenceError as e:
+                return ErrorResponse(
+                    status="unprocessed",
+                    reason=f"OCR confidence too low: {e.confidence}"
+                )
             
             raw_text = ocr_result["raw_text"]
             
             # Check OCR confidence
-            if ocr_result["ocr_confidence"] < 0.3:
+            if ocr_result["ocr_confidence"] < settings.OCR_MIN_CONFIDENCE:
                 return ErrorResponse(
                     status="unprocessed",
                     reason=f"OCR confidence too low: {ocr_result['ocr_confidence']}"
@@ -193,41 +220,75 @@ async def process_file_report(file: UploadFile = File(...)):
         
         # Step 2: Normalize tests
         logger.info("Step 2: Normalizing tests...")
-        normalized_result = normalizer_service.normalize_tests(raw_text)
-        
-        # Step 3: Validate extraction (hallucination check)
-        logger.info("Step 3: Validating extraction...")
-        validation_result = validator_service.validate_extraction(
-            raw_text,
-            normalized_result["tests"]
-        )
+        normalized_result = await normalizer_batcher.submit(raw_text)
         
-        # Check validation status
-        if validation_result["status"] == "unprocessed":
-            logger.warning(f"Validation failed: {validation_result['reason']}")
-            return ErrorResponse(
-                status="unprocessed",
-                reason=validation_result["reason"]
+        if settings.FUSE_VALIDATION_SUMMARY:
+            # Steps 3 & 4: Validate extraction (hallucination check) and generate
+            # the summary with a single LLM call
+            logger.info("Steps 3 & 4: Validating extraction and generating summary...")
+            validation_result, summary_result = await asyncio.to_thread(
+                validator_service.validate_and_summarize,
+                raw_text,
+                normalized_result["tests"]
             )
+            
+            # Check validation status
+            if validation_result["status"] == "unprocessed":
+                logger.warning("Validation failed: %s", validation_result["reason"])
+                return ErrorResponse(
+                    status="unprocessed",
+                    reason=validation_result["reason"]
+                )
+            
+            validated_tests = validation_result.get("tests", normalized_result["tests"])
+            if summary_result is None:
+                logger.info("No summary from validation step, generating it separately")
+                summary_result = await summarizer_service.agenerate_summary(validated_tests)
+        else:
+            # Steps 3 & 4: Validate extraction (hallucination check) while speculatively
+            # generating the summary from the normalized tests in parallel
+            logger.info("Step 3: Validating extraction...")
+            logger.info("Step 4: Generating summary...")
+            validation_task = asyncio.create_task(validator_service.avalidate_extraction(
+                raw_text,
+                normalized_result["tests"]
+            ))
+            summary_task = asyncio.create_task(summarizer_service.agenerate_summary(
+                normalized_result["tests"]
+            ))
+            
+            try:
+                validation_result = await validation_task
+            except Exception:
+                summary_task.cancel()
+                raise
+            
+            # Check validation status
+            if validation_result["status"] == "unprocessed":
+                logger.warning("Validation failed: %s", validation_result["reason"])
+                summary_task.cancel()
+                return ErrorResponse(
+                    status="unprocessed",
+                    reason=validation_result["reason"]
+                )
+            
+            validated_tests = validation_result.get("tests", normalized_result["tests"])
+            summary_result = await summary_task
         
-        # Step 4: Generate patient-friendly summary
-        logger.info("Step 4: Generating summary...")
-        validated_tests = validation_result.get("tests", normalized_result["tests"])
-        summary_result = summarizer_service.generate_summary(validated_tests)
-        
-        # Step 5: Combine results
-        final_response = FinalResponse(
-            tests=validated_tests,
+        # Step 5: Combine results. Tests and explanations are validated exactly
+        # once here, so the response model is assembled without re-validation
+        final_response = FinalResponse.model_construct(
+            tests=tests_adapter.validate_python(validated_tests),
             summary=summary_result["summary"],
-            explanations=summary_result["explanations"],
+            explanations=explanations_adapter.validate_python(summary_result["explanations"]),
             status="ok"
         )
         
-        logger.info(f"File processing completed successfully for {file.filename}")
-        return final_response
+        logger.info("File processing completed successfully for %s", file.filename)
+        return ORJSONResponse(final_response.model_dump(mode="json"))
         
     except Exception as e:
-        logger.error(f"File processing failed: {str(e)}")
+        logger.error("File processing failed: %s", e)
         return ErrorResponse(
             status="unprocessed",
             reason=f"Processing error: {str(e)}"
@@ -241,25 +302,37 @@ async def process_file_report(file: UploadFile = File(...)):
 async def startup_event():
     """Execute on application startup."""
     logger.info("Starting AI-Powered Medical Report Simplifier API")
-    logger.info(f"Using Ollama (Local LLM): {settings.LLM_MODEL_NAME}")
-    logger.info(f"Ollama URL: {settings.OLLAMA_URL}")
-    logger.info(f"API running on {settings.API_HOST}:{settings.API_PORT}")
+    logger.info("Using Ollama (Local LLM): %s", settings.LLM_MODEL_NAME)
+    logger.info("Ollama URL: %s", settings.OLLAMA_URL)
+    logger.info("API running on %s:%s", settings.API_HOST, settings.API_PORT)
+    normalizer_batcher.start()
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Execute on application shutdown."""
     logger.info("Shutting down AI-Powered Medical Report Simplifier API")
+    await normalizer_batcher.stop()
+    get_llm().close()
 
 # ============================================================================
 # MAIN EXECUTION
 # ============================================================================
 
 if __name__ == "__main__":
+    # Run with `python -m api.app`. Reload forces a single process, so it is
+    # only honoured for development (API_RELOAD=True); otherwise run WORKERS
+    # processes with uvloop and httptools.
     import uvicorn
+    workers = 1 if settings.API_RELOAD else settings.WORKERS
+    # Workers inherit this, so they split LLM_MAX_CONCURRENCY and OCR_CONCURRENCY between them
+    os.environ[WORKER_PROCESSES_ENV] = str(workers)
     uvicorn.run(
-        "app:app",
+        "api.app:app",
         host=settings.API_HOST,
         port=settings.API_PORT,
-        reload=settings.API_RELOAD
+        reload=settings.API_RELOAD,
+        workers=workers,
+        loop="uvloop",
+        http="httptools"
     )
@@ -2,6 +2,9 @@
 Application configuration settings.
 """
 
+import os
+from typing import Optional
+
 from pydantic_settings import BaseSettings
 
 
@@ -13,15 +16,41 @@ class Settings(BaseSettings):
     LLM_MODEL_NAME: str = "llama3.2:latest"
     LLM_MAX_TOKENS: int = 2048
     LLM_TEMPERATURE: float = 0.1
+    LLM_NUM_CTX: int = 4096  # Context window; must fit the system prompt plus the report
+    OLLAMA_KEEP_ALIVE: str = "30m"  # Keep the model loaded between requests
+    LLM_POOL_SIZE: int = 16  # Persistent HTTP connections to Ollama
     
     # API Configuration
     API_HOST: str = "0.0.0.0"
     API_PORT: int = 8000
-    API_RELOAD: bool = True
+    API_RELOAD: bool = False  # Development only: forces a single process
+    WORKERS: int = 2  # Uvicorn processes started by `python -m api.app`
     
     # Processing Configuration
     OCR_CONFIDENCE_THRESHOLD: float = 0.6
+    OCR_MIN_CONFIDENCE: float = 0.3  # Reject uploads whose OCR confidence is below this
+    OCR_MAX_DIMENSION: int = 2200  # Longest image side (px) passed to Tesseract
+    OCR_CONCURRENCY: int = os.cpu_count() or 4  # Parallel Tesseract processes (split between WORKERS under `python -m api.app`)
     VALIDATION_CONFIDENCE_THRESHOLD: float = 0.7
+    LOCAL_VALIDATION_ENABLED: bool = True  # Confirm tests by string matching before asking the LLM
+    LOCAL_VALIDATION_MIN_SCORE: float = 0.85  # Minimum fuzzy name match for a test to pass locally
+    LOCAL_VALIDATION_WINDOW_CHARS: int = 30  # Max distance between a test name and its value
+    VALIDATION_WINDOW_CHARS: int = 200  # Context kept around each test name in validation prompts (0 sends the full text)
+    VALIDATE_MAX_BATCH: int = 8  # Max reports validated in one LLM call by validate_extraction_batch
+    VALIDATE_MAX_CONCURRENCY: int = 4  # Validation batches in flight at once in validate_many
+    VALIDATE_REQUESTS_PER_MINUTE: int = 0  # Rate limit for validate_many batches (0 = unlimited)
+    FUSE_VALIDATION_SUMMARY: bool = True  # Validate and summarize with a single LLM call
+    NORMALIZER_FAST_PATH: bool = True  # Extract well-known tests with regexes before using the LLM
+    NORMALIZER_FAST_PATH_MIN_TESTS: int = 1
+    NORMALIZE_MAX_BATCH: int = 8  # Max concurrent reports normalized in one LLM call (also capped to fit LLM_MAX_TOKENS/LLM_NUM_CTX)
+    NORMALIZE_BATCH_WAIT_MS: int = 50  # How long to wait for more reports before calling the LLM
+    SUMMARY_TEMPLATES_ENABLED: bool = True  # Summarize all-normal / single-abnormal results without the LLM
+    
+    # LLM Response Cache Configuration
+    CACHE_ENABLED: bool = True
+    CACHE_TTL: int = 86400  # 24 hours
+    CACHE_MAX_ENTRIES: int = 1024  # In-process cache size when Redis is not configured
+    REDIS_URL: Optional[str] = None  # e.g. redis://localhost:6379/0 to share the cache across workers
     
     # Logging Configuration
     LOG_LEVEL: str = "INFO"
@@ -29,6 +58,12 @@ class Settings(BaseSettings):
     # LLM Timeout Configuration
     LLM_TIMEOUT: int = 300  # 5 minutes for large reports
     
+    # LLM Concurrency & Retry Configuration
+    LLM_MAX_CONCURRENCY: int = 4  # Max in-flight Ollama requests (split between WORKERS under `python -m api.app`)
+    LLM_MAX_RETRIES: int = 4  # Attempts for transient failures (429/5xx, timeouts)
+    LLM_RETRY_BACKOFF: float = 1.0  # Seconds before first retry; doubles each attempt, plus up to this much jitter
+    LLM_RETRY_MAX_DELAY: float = 30.0  # Cap on the backoff between attempts
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
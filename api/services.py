@@ -2,23 +2,169 @@
 All services for medical report processing in a single file.
 """
 
+import asyncio
+import copy
+import difflib
+import hashlib
 import json
 import logging
+import threading
+import time
 import requests
+import fitz  # PyMuPDF
+import numpy as np
+import orjson
 import pytesseract
 from PIL import Image
-from pdf2image import convert_from_bytes
 import io
-from typing import Dict, Any, List
+import os
+import random
+import re
+import subprocess
+import tempfile
+from collections import OrderedDict, defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import BinaryIO, Dict, Any, List, Optional, Tuple, Union
 from .config import settings
 
 logger = logging.getLogger(__name__)
 
 
+# ============================================================================
+# LLM RESPONSE CACHE
+# ============================================================================
+
+class LLMCache:
+    """Cache for parsed LLM responses, backed by Redis when configured or an in-process LRU."""
+    
+    def __init__(self):
+        self.enabled = settings.CACHE_ENABLED
+        self.ttl = settings.CACHE_TTL
+        self.max_entries = settings.CACHE_MAX_ENTRIES
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._redis = None
+        # Outcome of each logical LLM call in this process, exposed on the health endpoint:
+        # served from cache, joined an identical in-flight call, or sent to the LLM
+        self.stats = {"hits": 0, "coalesced": 0, "misses": 0}
+        
+        if self.enabled and settings.REDIS_URL:
+            import redis
+            self._redis = redis.Redis.from_url(settings.REDIS_URL)
+    
+    def make_key(self, *parts: Any) -> str:
+        """Build a cache key from the SHA-256 of the canonical JSON of everything that influences the LLM output."""
+        canonical = orjson.dumps(parts, default=str, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+        return f"llm:{hashlib.sha256(canonical).hexdigest()}"
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a cached response, or None on a miss."""
+        if not self.enabled:
+            return None
+        
+        if self._redis is not None:
+            try:
+                cached = self._redis.get(key)
+            except Exception as e:
+                logger.warning("Redis cache lookup failed: %s", e)
+                return None
+            return json.loads(cached) if cached else None
+        
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return json.loads(value)
+    
+    def record(self, outcome: str) -> None:
+        """Count one logical lookup as "hits", "coalesced" or "misses"."""
+        with self._lock:
+            self.stats[outcome] += 1
+    
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        """Store a response for the configured TTL."""
+        if not self.enabled:
+            return
+        
+        # Store serialized so callers can't mutate cached entries in place
+        serialized = json.dumps(value)
+        
+        if self._redis is not None:
+            try:
+                self._redis.setex(key, self.ttl, serialized)
+            except Exception as e:
+                logger.warning("Redis cache write failed: %s", e)
+            return
+        
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, serialized)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+# Shared by every LLMService instance
+llm_cache = LLMCache()
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _canonical_text(text: str) -> str:
+    """Collapse case and whitespace so near-identical reports (re-scans, re-uploads) share a cache key."""
+    return _WHITESPACE_RE.sub(" ", text).strip().casefold()
+
+
+def _to_json(value: Any, sort_keys: bool = False) -> str:
+    """Compact JSON text for prompts; orjson is several times faster than json.dumps on test lists."""
+    option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+    return orjson.dumps(value, option=option).decode("utf-8")
+
+
+def _canonical_tests(tests: List[Dict[str, Any]]) -> str:
+    """Serialize tests compactly and independently of list/key order; used for both cache keys and prompts."""
+    return _to_json(
+        sorted(tests, key=lambda test: str(test.get("name", "")).casefold()),
+        sort_keys=True
+    )
+
+
 # ============================================================================
 # LLM SERVICE
 # ============================================================================
 
+# Set by `python -m api.app` for the uvicorn workers it starts; any other launch
+# (e.g. a plain `uvicorn api.app:app`) runs a single process
+WORKER_PROCESSES_ENV = "API_WORKER_PROCESSES"
+
+
+def _per_worker(limit: int) -> int:
+    """This process's share of a limit, divided between the workers `python -m api.app` started."""
+    workers = max(1, int(os.environ.get(WORKER_PROCESSES_ENV, "1")))
+    return max(1, limit // workers)
+
+
+# HTTP statuses worth retrying: rate limiting and transient server errors
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Ollama serves a limited number of requests per loaded model; queue the rest
+# here instead of piling them onto the server
+_ollama_semaphore = threading.BoundedSemaphore(_per_worker(settings.LLM_MAX_CONCURRENCY))
+
+
+# Identical LLM calls currently in progress, keyed by cache key
+_inflight_requests: Dict[str, Future] = {}
+_inflight_lock = threading.Lock()
+
+
+class LLMTransientError(Exception):
+    """Retryable LLM failure (connection error, timeout, 429/5xx)."""
+
+
 class LLMService:
     """Service for LLM inference using Ollama (local)."""
     
@@ -27,85 +173,277 @@ class LLMService:
         self.max_tokens = settings.LLM_MAX_TOKENS
         self.temperature = settings.LLM_TEMPERATURE
         self.ollama_url = settings.OLLAMA_URL
-        self.api_url = f"{self.ollama_url}/api/generate"
+        self.api_url = f"{self.ollama_url}/api/chat"
+        self.num_ctx = settings.LLM_NUM_CTX
+        self.max_retries = max(1, settings.LLM_MAX_RETRIES)
+        self.retry_backoff = settings.LLM_RETRY_BACKOFF
+        self.retry_max_delay = settings.LLM_RETRY_MAX_DELAY
+        self.keep_alive = settings.OLLAMA_KEEP_ALIVE
+        
+        # Reuse TCP connections to Ollama instead of reconnecting on every call
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=settings.LLM_POOL_SIZE,
+            pool_maxsize=settings.LLM_POOL_SIZE
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+    
+    def close(self):
+        """Close pooled HTTP connections."""
+        self.session.close()
     
-    def generate_json(self, prompt: str) -> Dict[str, Any]:
-        """Generate and parse JSON response from LLM."""
+    def generate_json(
+        self,
+        prompt: str,
+        schema: Optional[Dict[str, Any]] = None,
+        system: Optional[str] = None,
+        cache_input: Optional[Any] = None
+    ) -> Dict[str, Any]:
+        """
+        Generate and parse JSON response from LLM, reusing cached responses for identical prompts.
+        
+        When a JSON schema is given, Ollama constrains decoding to it (structured outputs);
+        otherwise the response is only constrained to be valid JSON. Static instructions
+        should go in `system` so Ollama can reuse the KV cache for that shared prefix.
+        
+        `cache_input` replaces the prompt in the cache key with a canonical form of the
+        inputs the prompt was built from, so equivalent inputs share one cache entry.
+        """
+        cache_key = self._cache_key(prompt if cache_input is None else cache_input, schema, system)
+        cached = llm_cache.get(cache_key)
+        if cached is not None:
+            logger.info("Using cached LLM response")
+            llm_cache.record("hits")
+            return cached
+        
+        # Single-flight: if an identical call is already running, wait for its result
+        # instead of sending the same prompt to Ollama again
+        with _inflight_lock:
+            inflight = _inflight_requests.get(cache_key)
+            if inflight is None:
+                _inflight_requests[cache_key] = future = Future()
+        
+        if inflight is not None:
+            logger.info("Waiting for identical in-flight LLM request")
+            llm_cache.record("coalesced")
+            return copy.deepcopy(inflight.result())
+        
+        llm_cache.record("misses")
         try:
-            # Add JSON instruction to prompt
-            json_prompt = f"{prompt}\n\nYou must respond with valid JSON only. Do not include any explanatory text outside the JSON."
-            
-            payload = {
-                "model": self.model_name,
-                "prompt": json_prompt,
-                "stream": False,
-                "format": "json",
-                "options": {
-                    "temperature": self.temperature,
-                    "num_predict": self.max_tokens
-                }
+            result = self._generate_json(prompt, schema, system)
+            llm_cache.set(cache_key, result)
+            future.set_result(copy.deepcopy(result))
+            return result
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with _inflight_lock:
+                del _inflight_requests[cache_key]
+    
+    def _retry_delay(self, attempt: int) -> float:
+        """Exponential backoff capped at LLM_RETRY_MAX_DELAY, plus jitter so concurrent retries don't arrive together."""
+        delay = min(self.retry_max_delay, self.retry_backoff * 2 ** (attempt - 1))
+        return delay + random.uniform(0, self.retry_backoff)
+    
+    def _cache_key(self, prompt: Any, schema: Optional[Dict[str, Any]], system: Optional[str]) -> str:
+        """Cache key covering everything that influences the LLM output."""
+        return llm_cache.make_key({
+            "model": self.model_name,
+            "system": system,
+            "prompt": prompt,
+            "schema": schema,
+            "temperature": self.temperature,
+            "max_tokens": self.max_tokens,
+            "num_ctx": self.num_ctx
+        })
+    
+    def _build_payload(
+        self,
+        prompt: str,
+        schema: Optional[Dict[str, Any]],
+        system: Optional[str]
+    ) -> Dict[str, Any]:
+        """Build the Ollama chat request body."""
+        # Add JSON instruction to prompt
+        json_prompt = f"{prompt}\n\nYou must respond with valid JSON only. Do not include any explanatory text outside the JSON."
+        
+        messages = []
+        if system:
+            messages.append({"role": "system", "content": system})
+        messages.append({"role": "user", "content": json_prompt})
+        
+        # Prompts can be many KB; only render them when debug logging is on
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("LLM system prompt (%d chars), user prompt:\n%s", len(system or ""), json_prompt)
+        
+        return {
+            "model": self.model_name,
+            "messages": messages,
+            "stream": True,
+            "format": schema if schema is not None else "json",
+            "keep_alive": self.keep_alive,
+            "options": {
+                "temperature": self.temperature,
+                "num_predict": self.max_tokens,
+                "num_ctx": self.num_ctx
             }
+        }
+    
+    def _generate_json(
+        self,
+        prompt: str,
+        schema: Optional[Dict[str, Any]] = None,
+        system: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Call Ollama's chat endpoint and parse its JSON response."""
+        try:
+            payload = self._build_payload(prompt, schema, system)
             
-            logger.info(f"Calling Ollama API: {self.model_name}")
-            response = requests.post(self.api_url, json=payload, timeout=settings.LLM_TIMEOUT)
-            
-            if response.status_code != 200:
-                logger.error(f"Ollama API error: {response.status_code} - {response.text}")
-                raise Exception(f"Ollama API failed with status {response.status_code}")
-            
-            result = response.json()
-            response_text = result.get("response", "").strip()
+            for attempt in range(1, self.max_retries + 1):
+                try:
+                    # Bound in-flight Ollama requests across all services
+                    with _ollama_semaphore:
+                        response_text = self._post_chat(payload)
+                    break
+                except LLMTransientError as e:
+                    if attempt == self.max_retries:
+                        raise
+                    delay = self._retry_delay(attempt)
+                    logger.warning("Ollama call failed (%s), retrying in %.1fs (attempt %d/%d)",
+                                   e, delay, attempt, self.max_retries)
+                    time.sleep(delay)
             
             if not response_text:
                 logger.error("Empty response from Ollama")
                 raise Exception("Empty response from Ollama")
             
-            # Extract JSON from response
-            start_idx = response_text.find('{')
-            end_idx = response_text.rfind('}')
-            
-            if start_idx == -1 or end_idx == -1:
-                raise Exception("No JSON object found in LLM response")
-            
-            json_str = response_text[start_idx:end_idx + 1]
-            parsed_json = json.loads(json_str)
+            # Ollama's JSON/schema-constrained decoding guarantees a bare JSON object
+            parsed_json = json.loads(response_text)
             
             logger.info("Successfully generated and parsed JSON from LLM")
             return parsed_json
             
         except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse JSON from LLM: {str(e)}")
+            logger.error("Failed to parse JSON from LLM: %s", e)
             raise Exception(f"Invalid JSON from LLM: {str(e)}")
+        except LLMTransientError as e:
+            # Keep the type so batch callers know retrying per report is pointless
+            logger.error("LLM generation failed after %d attempts: %s", self.max_retries, e)
+            raise
         except Exception as e:
-            logger.error(f"LLM generation failed: {str(e)}")
+            logger.error("LLM generation failed: %s", e)
             raise Exception(f"LLM generation failed: {str(e)}")
+    
+    def _post_chat(self, payload: Dict[str, Any]) -> str:
+        """Send one chat request to Ollama, raising LLMTransientError for retryable failures."""
+        logger.info("Calling Ollama API: %s", self.model_name)
+        try:
+            with self.session.post(self.api_url, json=payload, timeout=settings.LLM_TIMEOUT, stream=True) as response:
+                if response.status_code in RETRYABLE_STATUS_CODES:
+                    raise LLMTransientError(f"Ollama API returned status {response.status_code}")
+                if response.status_code != 200:
+                    logger.error("Ollama API error: %s - %s", response.status_code, response.text)
+                    raise Exception(f"Ollama API failed with status {response.status_code}")
+                
+                return self._read_stream(response)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            raise LLMTransientError(f"Ollama request failed: {str(e)}") from e
+    
+    def _read_stream(self, response: requests.Response) -> str:
+        """Accumulate streamed Ollama chunks, aborting as soon as the output can't be JSON."""
+        chunks = []
+        started = False
+        
+        for line in response.iter_lines():
+            if not line:
+                continue
+            
+            chunk = json.loads(line)
+            if "error" in chunk:
+                raise Exception(f"Ollama stream error: {chunk['error']}")
+            
+            text = chunk.get("message", {}).get("content", "")
+            if not started and text.strip():
+                # JSON mode always opens with an object; anything else is malformed,
+                # so stop generating instead of waiting for the full completion
+                if not text.lstrip().startswith('{'):
+                    raise Exception("LLM response is not a JSON object")
+                started = True
+            chunks.append(text)
+            
+            if chunk.get("done"):
+                break
+        
+        return "".join(chunks).strip()
+
+
+# Process-wide client so every service shares one connection pool
+_llm_instance: Optional[LLMService] = None
+_llm_instance_lock = threading.Lock()
+
+
+def get_llm() -> LLMService:
+    """Return the shared LLMService, creating it on first use."""
+    global _llm_instance
+    if _llm_instance is None:
+        with _llm_instance_lock:
+            if _llm_instance is None:
+                _llm_instance = LLMService()
+    return _llm_instance
 
 
 # ============================================================================
 # OCR SERVICE
 # ============================================================================
 
+class LowConfidenceError(Exception):
+    """Raised when OCR is aborted early because the document is unreadable."""
+    
+    def __init__(self, confidence: float, pages: int):
+        self.confidence = confidence
+        self.pages = pages
+        super().__init__(f"OCR confidence too low: {confidence} after {pages} pages")
+
+
+# Every Tesseract run (image or PDF batch, from any request) goes through this pool,
+# so concurrent uploads queue here instead of multiplying Tesseract processes
+_tesseract_executor = ThreadPoolExecutor(
+    max_workers=_per_worker(settings.OCR_CONCURRENCY),
+    thread_name_prefix="tesseract"
+)
+
+
 class OCRService:
     """Service for OCR text extraction from images and PDFs."""
     
+    # Early abort: pages OCR'd before judging, and pages that must remain to bother
+    EARLY_ABORT_PROBE_PAGES = 2
+    EARLY_ABORT_MIN_REMAINING_PAGES = 3
+    
     def __init__(self):
         self.confidence_threshold = settings.OCR_CONFIDENCE_THRESHOLD
+        self.concurrency = _per_worker(settings.OCR_CONCURRENCY)
+        self.max_dimension = settings.OCR_MAX_DIMENSION
+        # Parallel Tesseract processes oversubscribe the CPU if each also spawns OpenMP threads
+        os.environ.setdefault("OMP_THREAD_LIMIT", "1")
     
-    def extract_from_image(self, image_bytes: bytes) -> Dict[str, Any]:
-        """Extract text from image using Tesseract OCR."""
+    def extract_from_image(self, image_source: Union[bytes, BinaryIO]) -> Dict[str, Any]:
+        """Extract text from image (raw bytes or a binary file object) using Tesseract OCR."""
         try:
-            image = Image.open(io.BytesIO(image_bytes))
-            ocr_data = pytesseract.image_to_data(image, output_type=pytesseract.Output.DICT)
-            raw_text = pytesseract.image_to_string(image)
+            if isinstance(image_source, bytes):
+                image_source = io.BytesIO(image_source)
+            image = self._prepare_image(Image.open(image_source))
+            raw_text, confidences = _tesseract_executor.submit(self._run_tesseract, image).result()
             
             # Calculate average confidence
-            confidences = [int(conf) for conf in ocr_data['conf'] if int(conf) > 0]
-            avg_confidence = sum(confidences) / len(confidences) / 100.0 if confidences else 0.0
+            avg_confidence = float(confidences.mean()) / 100.0 if confidences.size else 0.0
             
             # Split into lines and filter empty lines
             lines = [line.strip() for line in raw_text.split('\n') if line.strip()]
             
-            logger.info(f"OCR extraction completed. Confidence: {avg_confidence:.2f}")
+            logger.info("OCR extraction completed. Confidence: %.2f", avg_confidence)
             
             return {
                 "raw_text": raw_text.strip(),
@@ -114,37 +452,47 @@ class OCRService:
             }
             
         except Exception as e:
-            logger.error(f"OCR extraction failed: {str(e)}")
+            logger.error("OCR extraction failed: %s", e)
             raise Exception(f"OCR failed: {str(e)}")
     
-    def extract_from_pdf(self, pdf_bytes: bytes) -> Dict[str, Any]:
-        """Extract text from PDF by converting to images first."""
+    def extract_from_pdf(
+        self,
+        pdf_source: Union[bytes, BinaryIO],
+        early_abort_threshold: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Extract text from PDF (raw bytes or a binary file object) by converting to images first.
+        
+        When early_abort_threshold is given and the first pages already average below it,
+        raises LowConfidenceError instead of OCR'ing the rest of a long document.
+        """
         try:
-            images = convert_from_bytes(pdf_bytes)
+            pdf_bytes = pdf_source if isinstance(pdf_source, bytes) else pdf_source.read()
+            images = self._rasterize_pdf(pdf_bytes)
             all_text = []
             all_lines = []
-            all_confidences = []
+            confidence_sum = 0.0
+            confidence_count = 0
             
-            # Process each page
-            for page_num, image in enumerate(images, 1):
-                logger.info(f"Processing PDF page {page_num}")
-                
-                ocr_data = pytesseract.image_to_data(image, output_type=pytesseract.Output.DICT)
-                page_text = pytesseract.image_to_string(image)
-                
-                confidences = [int(conf) for conf in ocr_data['conf'] if int(conf) > 0]
-                if confidences:
-                    all_confidences.extend(confidences)
-                
+            probe_pages = 0
+            if (early_abort_threshold is not None and
+                    len(images) - self.EARLY_ABORT_PROBE_PAGES >= self.EARLY_ABORT_MIN_REMAINING_PAGES):
+                probe_pages = self.EARLY_ABORT_PROBE_PAGES
+            page_results = self._ocr_in_batches(images, probe_pages, early_abort_threshold)
+            
+            # Combine page results in page order
+            for page_text, confidences in page_results:
+                confidence_sum += float(confidences.sum())
+                confidence_count += confidences.size
                 all_text.append(page_text.strip())
                 page_lines = [line.strip() for line in page_text.split('\n') if line.strip()]
                 all_lines.extend(page_lines)
             
             # Calculate overall confidence
-            avg_confidence = sum(all_confidences) / len(all_confidences) / 100.0 if all_confidences else 0.0
+            avg_confidence = confidence_sum / confidence_count / 100.0 if confidence_count else 0.0
             combined_text = "\n".join(all_text)
             
-            logger.info(f"PDF OCR extraction completed. Confidence: {avg_confidence:.2f}")
+            logger.info("PDF OCR extraction completed. Confidence: %.2f", avg_confidence)
             
             return {
                 "raw_text": combined_text,
@@ -152,76 +500,372 @@ class OCRService:
                 "ocr_confidence": round(avg_confidence, 2)
             }
             
+        except LowConfidenceError:
+            raise
         except Exception as e:
-            logger.error(f"PDF OCR extraction failed: {str(e)}")
+            logger.error("PDF OCR extraction failed: %s", e)
             raise Exception(f"PDF OCR failed: {str(e)}")
-
-
-# ============================================================================
-# NORMALIZER SERVICE
-# ============================================================================
-
-class NormalizerService:
-    """Service for normalizing medical test results using LLM."""
     
-    def __init__(self):
-        self.llm = LLMService()
+    def _prepare_image(self, image: Image.Image) -> Image.Image:
+        """Downscale oversized images and convert to grayscale before OCR."""
+        scale = min(1.0, self.max_dimension / max(image.size))
+        if scale < 1.0:
+            width, height = image.size
+            image = image.resize((int(width * scale), int(height * scale)), Image.Resampling.LANCZOS)
+        return image.convert("L")
     
-    def normalize_tests(self, raw_text: str) -> Dict[str, Any]:
-        """Extract and normalize medical tests from raw text."""
+    def _rasterize_pdf(self, pdf_bytes: bytes, dpi: int = 200) -> List[Image.Image]:
+        """Render each PDF page to a grayscale PIL image in-process with PyMuPDF."""
+        images = []
+        with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+            for page in doc:
+                # Render at the target DPI, capped so the long side stays within max_dimension
+                zoom = min(dpi / 72.0, self.max_dimension / max(page.rect.width, page.rect.height))
+                pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), colorspace=fitz.csGRAY)
+                images.append(Image.frombytes("L", (pix.width, pix.height), pix.samples))
+        return images
+    
+    def _ocr_in_batches(
+        self,
+        images: List[Image.Image],
+        probe_pages: int = 0,
+        early_abort_threshold: Optional[float] = None
+    ) -> List[tuple]:
+        """
+        OCR pages in parallel, returning (text, confidences) per page in page order.
+        
+        With probe_pages set, the first pages are OCR'd one per task ahead of the
+        remaining batches and checked against early_abort_threshold as they complete;
+        LowConfidenceError is raised and batches not yet started are cancelled if they
+        fall short.
+        """
+        if not images:
+            return []
+        
+        # Probe pages are submitted first so they take the first free slots
+        probe_futures = [
+            _tesseract_executor.submit(self._ocr_pages, (page + 1, [image]))
+            for page, image in enumerate(images[:probe_pages])
+        ]
+        
+        # Split the remaining pages into one contiguous batch per worker. Each batch is
+        # OCR'd by a single Tesseract process on the shared pool, which runs batches
+        # in parallel threads since Tesseract works outside the GIL
+        rest = images[probe_pages:]
+        rest_futures = []
+        if rest:
+            workers = min(self.concurrency, len(rest))
+            batch_size = -(-len(rest) // workers)
+            rest_futures = [
+                _tesseract_executor.submit(self._ocr_pages, (probe_pages + start + 1, rest[start:start + batch_size]))
+                for start in range(0, len(rest), batch_size)
+            ]
+        
+        def probe_mean() -> float:
+            confidences = np.concatenate([conf for future in probe_futures for _, conf in future.result()])
+            return float(confidences.mean()) / 100.0 if confidences.size else 0.0
+        
+        def cancel_rest_if_failed(_: Future) -> None:
+            # Runs on the worker that finished the last probe page before it picks up a
+            # queued batch, so batches not yet started are reliably dropped
+            if not all(future.done() for future in probe_futures):
+                return
+            if any(future.exception() for future in probe_futures) or probe_mean() < early_abort_threshold:
+                for future in rest_futures:
+                    future.cancel()
+        
+        for future in probe_futures:
+            future.add_done_callback(cancel_rest_if_failed)
+        
         try:
-            prompt = self._create_normalization_prompt(raw_text)
-            
-            logger.info("Calling LLM for test normalization")
-            result = self.llm.generate_json(prompt)
-            
-            # Validate response structure
-            if "tests" not in result:
-                raise Exception("LLM response missing 'tests' field")
-            
-            if "normalization_confidence" not in result:
-                result["normalization_confidence"] = 0.8
-            
-            # Basic validation and data cleaning
-            if not result["tests"]:
-                logger.warning("No tests extracted by LLM")
-                result["tests"] = []
-            else:
-                # Filter out incomplete tests that have None values
-                cleaned_tests = []
-                for test in result["tests"]:
-                    # Check if all required fields are present and not None
-                    if (test.get("name") and 
-                        test.get("value") is not None and 
-                        test.get("unit") and 
-                        test.get("status") and 
-                        test.get("ref_range") and
-                        test.get("ref_range", {}).get("low") is not None and
-                        test.get("ref_range", {}).get("high") is not None):
-                        cleaned_tests.append(test)
-                    else:
-                        logger.warning(f"Skipping incomplete test: {test}")
-                
-                result["tests"] = cleaned_tests
-                logger.info(f"Filtered to {len(cleaned_tests)} complete tests from {len(result['tests'])} total")
+            for future in as_completed(probe_futures):
+                future.result()
+            confidence = probe_mean() if probe_futures else None
+            if confidence is not None and confidence < early_abort_threshold:
+                logger.warning("Aborting PDF OCR: confidence %.2f after %d pages", confidence, probe_pages)
+                raise LowConfidenceError(round(confidence, 2), probe_pages)
+            return [page for future in probe_futures + rest_futures for page in future.result()]
+        except BaseException:
+            # The request is failing; drop batches still queued (running ones finish on their own)
+            for future in rest_futures:
+                future.cancel()
+            raise
+    
+    def _ocr_pages(self, batch: tuple) -> List[tuple]:
+        """OCR a batch of consecutive PDF pages, returning (text, confidences) per page."""
+        first_page, images = batch
+        logger.info("Processing PDF pages %d-%d", first_page, first_page + len(images) - 1)
+        
+        if len(images) == 1:
+            return [self._run_tesseract(images[0])]
+        return self._batch_tesseract(images)
+    
+    def _run_tesseract(self, image: Image.Image) -> tuple:
+        """Run a single Tesseract pass and rebuild both text and word confidences from it."""
+        # Raw TSV rather than Output.DICT, which truncates confidences to int
+        tsv = pytesseract.image_to_data(image)
+        return self._assemble_page(self._parse_tsv(tsv)[1])
+    
+    def _batch_tesseract(self, images: List[Image.Image]) -> List[tuple]:
+        """OCR several images with one Tesseract process via a list file, sharing model load."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            image_paths = []
+            for index, image in enumerate(images):
+                path = os.path.join(tmp_dir, f"page_{index:04d}.png")
+                image.save(path)
+                image_paths.append(path)
             
-            logger.info(f"Normalized {len(result['tests'])} tests")
-            return result
+            filelist = os.path.join(tmp_dir, "filelist.txt")
+            with open(filelist, "w") as f:
+                f.write("\n".join(image_paths) + "\n")
             
-        except Exception as e:
-            logger.error(f"Test normalization failed: {str(e)}")
-            raise Exception(f"Normalization failed: {str(e)}")
+            result = subprocess.run(
+                [pytesseract.pytesseract.tesseract_cmd, filelist, "stdout", "tsv"],
+                capture_output=True,
+                text=True
+            )
+        
+        if result.returncode != 0:
+            raise Exception(f"Tesseract failed: {result.stderr.strip()}")
+        
+        words_by_page = self._parse_tsv(result.stdout)
+        return [self._assemble_page(words_by_page[page]) for page in range(1, len(images) + 1)]
     
-    def _create_normalization_prompt(self, raw_text: str) -> str:
-        """Create flexible prompt that works with any medical report."""
-        return f"""You are a medical data extraction expert. Extract test results from ANY medical report and return them in EXACT JSON format.
+    def _parse_tsv(self, tsv: str) -> Dict[int, list]:
+        """Group Tesseract TSV rows by page as (block, par, line, conf, text), keeping float confidences."""
+        # TSV columns: level, page_num, block_num, par_num, line_num, word_num,
+        # left, top, width, height, conf, text
+        words_by_page = defaultdict(list)
+        for row in tsv.splitlines()[1:]:
+            columns = row.split('\t')
+            if len(columns) < 12:
+                continue
+            words_by_page[int(columns[1])].append(
+                (columns[2], columns[3], columns[4], columns[10], columns[11])
+            )
+        return words_by_page
+    
+    def _assemble_page(self, words) -> tuple:
+        """Rebuild page text and word confidences from (block, par, line, conf, text) rows."""
+        # Group recognised words back into lines, preserving Tesseract's reading order
+        lines = defaultdict(list)
+        raw_confidences = []
+        for block, par, line, conf, word in words:
+            if word and word.strip():
+                lines[(block, par, line)].append(word.strip())
+            raw_confidences.append(conf)
+        
+        # Non-word rows carry a confidence of -1; keep only real word scores
+        confidences = np.asarray(raw_confidences, dtype=np.float32)
+        confidences = confidences[confidences > 0]
+        
+        text = "\n".join(" ".join(line_words) for line_words in lines.values())
+        return text, confidences
 
-CRITICAL: You MUST return valid JSON that matches this EXACT structure. Every field is required.
 
-INPUT TEXT:
-{raw_text}
+# ============================================================================
+# NORMALIZER SERVICE
+# ============================================================================
+
+# Canonical test name -> (unit, reference low, reference high), used by the
+# pattern-based fast path when the report doesn't print its own range. Tests
+# whose range depends on sex, or that only have a lower limit (HDL), have no
+# default: they are only handled here when the report prints a range.
+_REFERENCE_RANGES = {
+    "Hemoglobin": ("g/dL", None, None),
+    "Hematocrit": ("%", None, None),
+    "White Blood Cells": ("/uL", 4000.0, 11000.0),
+    "Red Blood Cells": ("million/uL", None, None),
+    "Platelets": ("/uL", 150000.0, 450000.0),
+    "Glucose": ("mg/dL", 70.0, 100.0),
+    "Creatinine": ("mg/dL", 0.6, 1.2),
+    "Blood Urea Nitrogen": ("mg/dL", 7.0, 20.0),
+    "Sodium": ("mEq/L", 136.0, 145.0),
+    "Potassium": ("mEq/L", 3.5, 5.0),
+    "Chloride": ("mEq/L", 98.0, 107.0),
+    "Bicarbonate": ("mEq/L", 22.0, 29.0),
+    "Thyroid Stimulating Hormone": ("mIU/L", 0.4, 4.0),
+    "Free Thyroxine": ("ng/dL", 0.8, 1.8),
+    "Hemoglobin A1c": ("%", 4.0, 5.6),
+    "Total Cholesterol": ("mg/dL", 0.0, 200.0),
+    "HDL Cholesterol": ("mg/dL", None, None),
+    "LDL Cholesterol": ("mg/dL", 0.0, 130.0),
+    "Triglycerides": ("mg/dL", 0.0, 150.0),
+    "Alanine Aminotransferase": ("U/L", 7.0, 56.0),
+    "Aspartate Aminotransferase": ("U/L", 10.0, 40.0),
+    "Alkaline Phosphatase": ("U/L", 44.0, 147.0),
+    "Total Bilirubin": ("mg/dL", 0.1, 1.2),
+    "Albumin": ("g/dL", 3.5, 5.0),
+    "Estimated Glomerular Filtration Rate": ("mL/min/1.73m²", 90.0, 150.0),
+    "Uric Acid": ("mg/dL", None, None),
+    "Vitamin D": ("ng/mL", 30.0, 100.0),
+    "Vitamin B12": ("pg/mL", 200.0, 900.0),
+    "Folate": ("ng/mL", 2.7, 17.0),
+    "C-Reactive Protein": ("mg/L", 0.0, 10.0),
+}
+
+# Lower-cased names/abbreviations seen in reports -> canonical test name
+_TEST_SYNONYMS = {
+    synonym: canonical
+    for canonical, synonyms in {
+        "Hemoglobin": ["hemoglobin", "haemoglobin", "hb", "hgb"],
+        "Hematocrit": ["hematocrit", "haematocrit", "hct", "pcv"],
+        "White Blood Cells": ["white blood cells", "white blood cell count", "wbc", "wbc count", "total leukocyte count", "tlc"],
+        "Red Blood Cells": ["red blood cells", "red blood cell count", "rbc", "rbc count"],
+        "Platelets": ["platelets", "platelet count", "plt"],
+        "Glucose": ["glucose", "gluc", "blood glucose", "fasting glucose", "fasting blood sugar", "fbs"],
+        "Creatinine": ["creatinine", "creat", "serum creatinine"],
+        "Blood Urea Nitrogen": ["blood urea nitrogen", "bun"],
+        "Sodium": ["sodium", "na"],
+        "Potassium": ["potassium", "k"],
+        "Chloride": ["chloride", "cl"],
+        "Bicarbonate": ["bicarbonate", "co2", "hco3"],
+        "Thyroid Stimulating Hormone": ["thyroid stimulating hormone", "tsh"],
+        "Free Thyroxine": ["free thyroxine", "free t4", "ft4"],
+        "Hemoglobin A1c": ["hemoglobin a1c", "hba1c", "a1c", "glycated hemoglobin"],
+        "Total Cholesterol": ["total cholesterol", "cholesterol", "chol"],
+        "HDL Cholesterol": ["hdl cholesterol", "hdl"],
+        "LDL Cholesterol": ["ldl cholesterol", "ldl"],
+        "Triglycerides": ["triglycerides", "tg"],
+        "Alanine Aminotransferase": ["alanine aminotransferase", "alt", "sgpt"],
+        "Aspartate Aminotransferase": ["aspartate aminotransferase", "ast", "sgot"],
+        "Alkaline Phosphatase": ["alkaline phosphatase", "alp"],
+        "Total Bilirubin": ["total bilirubin", "bilirubin"],
+        "Albumin": ["albumin"],
+        "Estimated Glomerular Filtration Rate": ["estimated glomerular filtration rate", "egfr"],
+        "Uric Acid": ["uric acid"],
+        "Vitamin D": ["vitamin d", "25-oh vitamin d"],
+        "Vitamin B12": ["vitamin b12", "b12"],
+        "Folate": ["folate", "folic acid"],
+        "C-Reactive Protein": ["c-reactive protein", "crp"],
+    }.items()
+    for synonym in synonyms
+}
+
+# Any known test name or alias as a whole word; longest first so "Hemoglobin A1c" beats "Hemoglobin"
+_KNOWN_TEST_RE = re.compile(
+    r"\b(?:" + "|".join(
+        re.escape(term).replace(r"\ ", r"\s+")
+        for term in sorted(_TEST_SYNONYMS, key=len, reverse=True)
+    ) + r")\b",
+    re.IGNORECASE
+)
+
+# Unit spellings seen in reports -> unit used in _REFERENCE_RANGES
+_UNIT_ALIASES = {
+    "/μl": "/uL",
+    "/µl": "/uL",
+    "/mm3": "/uL",
+    "cells/ul": "/uL",
+    "x10^6/ul": "million/uL",
+    "mil/ul": "million/uL",
+    "miu/ml": "mIU/L",
+    "uiu/ml": "mIU/L",
+    "µiu/ml": "mIU/L",
+    "ml/min/1.73m2": "mL/min/1.73m²",
+    "ml/min/1.73 m²": "mL/min/1.73m²",
+    "ml/min/1.73 m2": "mL/min/1.73m²",
+}
+
+_UNIT_PATTERN = (
+    r"million/uL|mil/uL|x10\^6/uL|cells/uL|/uL|/μL|/µL|/mm3|"
+    r"mL/min/1\.73\s?m[²2]|mg/dL|g/dL|ng/dL|mg/L|mEq/L|mmol/L|U/L|"
+    r"ng/mL|pg/mL|mIU/L|mIU/mL|uIU/mL|µIU/mL|%"
+)
+
+# "<name>[:=-] <value> <unit>", e.g. "Hb: 8.5 g/dL" or "WBC 15,800 /uL"
+_TEST_RESULT_RE = re.compile(
+    r"(?P<name>[A-Za-z][A-Za-z0-9 .\-]*?)\s*[:=\-]?\s*"
+    r"(?P<value>\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d+(?:\.\d+)?)\s*"
+    r"(?P<unit>" + _UNIT_PATTERN + r")(?![A-Za-z])",
+    re.IGNORECASE
+)
+
+# A number followed by anything unit-like, supported or not ("45 mm/hr", "72 fL",
+# "120 IU/L"); used to detect results the extractor missed. Dates like 01/15 don't count.
+_UNIT_LIKE_RE = re.compile(
+    r"\d\s*(?:%|(?:[a-zµμ][a-zµμ0-9^.]*)?/[a-zµμ]|"
+    r"(?:k?iu|m?u|fl|pg|ng|[uµμ]g|mcg|mg|g|mmol|meq|sec)\b)",
+    re.IGNORECASE
+)
+
+_PARENTHESIZED_RE = re.compile(r"\([^)]*\)")
+
+# "Normal: 12.0-15.5", "ref: 4,500 - 11,000" or "Normal: <5.7%"
+_REFERENCE_RANGE_RE = re.compile(
+    r"(?:normal|ref(?:erence)?(?:\s*range)?)\s*[:=]?\s*"
+    r"(?:(?P<low>\d[\d,]*(?:\.\d+)?)\s*[-–]\s*(?P<high>\d[\d,]*(?:\.\d+)?)|<\s*(?P<below>\d[\d,]*(?:\.\d+)?))",
+    re.IGNORECASE
+)
+
+
+_STATUS_LABELS = ("low", "normal", "high")
+
+# JSON schemas passed to Ollama's structured outputs; mirror NormalizedTestsResponse
+_TEST_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "name": {"type": "string"},
+        "value": {"type": "number"},
+        "unit": {"type": "string"},
+        "status": {"type": "string", "enum": list(_STATUS_LABELS)},
+        "ref_range": {
+            "type": "object",
+            "properties": {
+                "low": {"type": "number"},
+                "high": {"type": "number"}
+            },
+            "required": ["low", "high"]
+        }
+    },
+    "required": ["name", "value", "unit", "status", "ref_range"]
+}
+
+NORMALIZATION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "tests": {"type": "array", "items": _TEST_SCHEMA},
+        "normalization_confidence": {"type": "number", "minimum": 0.0, "maximum": 1.0}
+    },
+    "required": ["tests", "normalization_confidence"]
+}
+
+BATCH_NORMALIZATION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "reports": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "report_id": {"type": "integer"},
+                    **NORMALIZATION_SCHEMA["properties"]
+                },
+                "required": ["report_id", *NORMALIZATION_SCHEMA["required"]]
+            }
+        }
+    },
+    "required": ["reports"]
+}
+
+# Rough sizing used to keep a multi-report prompt within LLM_NUM_CTX / LLM_MAX_TOKENS:
+# ~4 characters per prompt token, and each report line holding a number may become a
+# test object in the response
+_CHARS_PER_TOKEN = 4
+_OUTPUT_TOKENS_PER_RESULT_LINE = 50
+_OUTPUT_TOKENS_PER_REPORT = 30
 
-EXTRACT ONLY tests mentioned in the text above. For each test, provide:
+
+def _classify_statuses(values: np.ndarray, lows: np.ndarray, highs: np.ndarray) -> np.ndarray:
+    """Return 0/1/2 (low/normal/high) for each value against its reference range."""
+    return np.where(values < lows, 0, np.where(values > highs, 2, 1)).astype(np.int8)
+
+
+class NormalizerService:
+    """Service for normalizing medical test results using LLM."""
+    
+    # Static instructions shared by the single-report and batched system prompts
+    EXTRACTION_GUIDELINES = """EXTRACT ONLY tests mentioned in the input text. For each test, provide:
 1. Standardized medical name (use full names, not abbreviations)
 2. Numeric value (convert OCR errors: O→0, l→1, I→1, remove commas)
 3. Standardized unit (mg/dL, g/dL, /uL, U/L, mEq/L, %, etc.)
@@ -244,7 +888,31 @@ COMMON MEDICAL TESTS (use these as guidance, not limits):
 - Lipid: Total Cholesterol, LDL, HDL, Triglycerides
 - Thyroid: TSH, T3, T4, Free T4
 - Kidney: Creatinine, BUN, eGFR
-- Inflammatory: CRP, ESR, Procalcitonin
+- Inflammatory: CRP, ESR, Procalcitonin"""
+    
+    EXTRACTION_RULES = """RULES:
+- ALL numeric values must be floats (e.g., 10.2, not 10)
+- ALL reference range values must be floats (e.g., 12.0, not 12)
+- Test names must be full medical names (e.g., "Hemoglobin" not "Hb")
+- Units must be standardized medical units
+- Status must be "low", "normal", or "high" based on medical knowledge
+- Confidence must be between 0.0 and 1.0
+- Extract tests from ANY medical specialty (cardiology, neurology, oncology, etc.)
+- ONLY include tests that have complete information (name, value, unit)
+- SKIP incomplete entries, headers, or partial data
+- If a test entry is missing values, DO NOT include it in the results
+
+EXAMPLES OF FLEXIBLE EXTRACTION:
+- "Hb: 8.5 g/dL" → "Hemoglobin: 8.5 g/dL (low, ref: 12.0-17.0)"
+- "Troponin I: 0.15 ng/mL" → "Troponin I: 0.15 ng/mL (high, ref: 0.0-0.04)"
+- "TSH: 8.2 mIU/L" → "Thyroid Stimulating Hormone: 8.2 mIU/L (high, ref: 0.4-4.0)\""""
+    
+    # Static system prompts: identical across calls so Ollama can reuse their KV cache
+    NORMALIZATION_SYSTEM_PROMPT = f"""You are a medical data extraction expert. Extract test results from ANY medical report and return them in EXACT JSON format.
+
+CRITICAL: You MUST return valid JSON that matches this EXACT structure. Every field is required.
+
+{EXTRACTION_GUIDELINES}
 
 REQUIRED JSON FORMAT (copy this structure exactly):
 {{
@@ -263,150 +931,1123 @@ REQUIRED JSON FORMAT (copy this structure exactly):
   "normalization_confidence": 0.0_to_1.0
 }}
 
-RULES:
-- ALL numeric values must be floats (e.g., 10.2, not 10)
-- ALL reference range values must be floats (e.g., 12.0, not 12)
-- Test names must be full medical names (e.g., "Hemoglobin" not "Hb")
-- Units must be standardized medical units
-- Status must be "low", "normal", or "high" based on medical knowledge
-- Confidence must be between 0.0 and 1.0
-- Extract tests from ANY medical specialty (cardiology, neurology, oncology, etc.)
-- ONLY include tests that have complete information (name, value, unit)
-- SKIP incomplete entries, headers, or partial data
-- If a test entry is missing values, DO NOT include it in the results
+{EXTRACTION_RULES}"""
+    
+    BATCH_NORMALIZATION_SYSTEM_PROMPT = f"""You are a medical data extraction expert. The input contains several SEPARATE medical reports. Extract test results from EACH report independently and return them in EXACT JSON format.
 
-EXAMPLES OF FLEXIBLE EXTRACTION:
-- "Hb: 8.5 g/dL" → "Hemoglobin: 8.5 g/dL (low, ref: 12.0-17.0)"
-- "Troponin I: 0.15 ng/mL" → "Troponin I: 0.15 ng/mL (high, ref: 0.0-0.04)"
-- "TSH: 8.2 mIU/L" → "Thyroid Stimulating Hormone: 8.2 mIU/L (high, ref: 0.4-4.0)"
+CRITICAL: You MUST return valid JSON that matches this EXACT structure. Every field is required. Never mix tests between reports.
+
+{EXTRACTION_GUIDELINES}
+
+REQUIRED JSON FORMAT (copy this structure exactly, one entry per report):
+{{
+  "reports": [
+    {{
+      "report_id": report_number,
+      "tests": [
+        {{
+          "name": "Standardized Test Name",
+          "value": numeric_value,
+          "unit": "standardized_unit",
+          "status": "low|normal|high",
+          "ref_range": {{
+            "low": numeric_lower_bound,
+            "high": numeric_upper_bound
+          }}
+        }}
+      ],
+      "normalization_confidence": 0.0_to_1.0
+    }}
+  ]
+}}
+
+{EXTRACTION_RULES}"""
+    
+    def __init__(self):
+        self.llm = get_llm()
+    
+    def normalize_tests(self, raw_text: str) -> Dict[str, Any]:
+        """Extract and normalize medical tests from raw text."""
+        result = self._extract_with_patterns(raw_text)
+        if result is not None:
+            return result
+        return self._normalize_with_llm(raw_text)
+    
+    def _normalize_with_llm(self, raw_text: str) -> Dict[str, Any]:
+        """Normalize one report with the LLM."""
+        try:
+            prompt = self._create_normalization_prompt(raw_text)
+            
+            logger.info("Calling LLM for test normalization")
+            result = self.llm.generate_json(
+                prompt,
+                schema=NORMALIZATION_SCHEMA,
+                system=self.NORMALIZATION_SYSTEM_PROMPT
+            )
+            
+            return self._clean_result(result)
+            
+        except LLMTransientError:
+            raise
+        except Exception as e:
+            logger.error("Test normalization failed: %s", e)
+            raise Exception(f"Normalization failed: {str(e)}")
+    
+    def _fits_batch_budget(self, raw_texts: List[str]) -> bool:
+        """Whether one multi-report prompt for raw_texts is expected to fit LLM_MAX_TOKENS and LLM_NUM_CTX."""
+        prompt_chars = len(self.BATCH_NORMALIZATION_SYSTEM_PROMPT) + len(self._create_batch_normalization_prompt(raw_texts))
+        output_tokens = sum(
+            _OUTPUT_TOKENS_PER_REPORT + _OUTPUT_TOKENS_PER_RESULT_LINE * sum(
+                1 for line in raw_text.splitlines() if any(char.isdigit() for char in line)
+            )
+            for raw_text in raw_texts
+        )
+        return (output_tokens <= self.llm.max_tokens and
+                prompt_chars // _CHARS_PER_TOKEN + output_tokens <= self.llm.num_ctx)
+    
+    def _normalize_batch_with_llm(self, raw_texts: List[str]) -> List[Union[Dict[str, Any], Exception]]:
+        """Normalize several reports with one multi-report LLM prompt; failures are returned per report."""
+        if len(raw_texts) == 1:
+            try:
+                return [self._normalize_with_llm(raw_texts[0])]
+            except Exception as e:
+                return [e]
+        
+        try:
+            prompt = self._create_batch_normalization_prompt(raw_texts)
+            
+            logger.info("Calling LLM for batched normalization of %d reports", len(raw_texts))
+            result = self.llm.generate_json(
+                prompt,
+                schema=BATCH_NORMALIZATION_SCHEMA,
+                system=self.BATCH_NORMALIZATION_SYSTEM_PROMPT
+            )
+            
+            if "reports" not in result:
+                raise Exception("LLM response missing 'reports' field")
+            reports = {
+                str(report.get("report_id")): report
+                for report in result["reports"]
+                if isinstance(report, dict)
+            }
+        except LLMTransientError:
+            # Retries are exhausted; per-report calls would only repeat them for every report
+            raise
+        except Exception as e:
+            logger.warning("Batched normalization failed, falling back to per-report calls: %s", e)
+            reports = {}
+        
+        results: List[Union[Dict[str, Any], Exception, None]] = [None] * len(raw_texts)
+        fallback = []
+        for index in range(len(raw_texts)):
+            report = reports.get(str(index + 1))
+            if report is not None and "tests" in report:
+                results[index] = self._clean_result(report)
+            else:
+                fallback.append(index)
+        
+        if fallback:
+            # Demultiplexing failed for these reports; normalize each on its own, concurrently
+            with ThreadPoolExecutor(max_workers=len(fallback)) as executor:
+                futures = {index: executor.submit(self._normalize_with_llm, raw_texts[index]) for index in fallback}
+            for index, future in futures.items():
+                try:
+                    results[index] = future.result()
+                except LLMTransientError:
+                    raise
+                except Exception as e:
+                    results[index] = e
+        return results
+    
+    def _extract_with_patterns(self, raw_text: str) -> Optional[Dict[str, Any]]:
+        """
+        Deterministically extract tests when every result in the text is a known test.
+        
+        Returns None when any result-looking entry can't be resolved, so the caller
+        falls back to the LLM rather than silently dropping tests.
+        """
+        if not settings.NORMALIZER_FAST_PATH:
+            return None
+        
+        tests = []
+        for line in raw_text.splitlines():
+            # Reference ranges live in parentheses; only the main clause holds results
+            main_clause = _PARENTHESIZED_RE.sub(" ", line)
+            matches = list(_TEST_RESULT_RE.finditer(main_clause))
+            if self._has_unresolved_result(main_clause, matches):
+                return None
+            
+            for match in matches:
+                test = self._build_test(match, line if len(matches) == 1 else None)
+                if test is None:
+                    return None
+                tests.append(test)
+        
+        if len(tests) < settings.NORMALIZER_FAST_PATH_MIN_TESTS:
+            return None
+        
+        # Classify every test against its reference range in one vectorized pass
+        statuses = _classify_statuses(
+            np.fromiter((test["value"] for test in tests), dtype=np.float64, count=len(tests)),
+            np.fromiter((test["ref_range"]["low"] for test in tests), dtype=np.float64, count=len(tests)),
+            np.fromiter((test["ref_range"]["high"] for test in tests), dtype=np.float64, count=len(tests))
+        )
+        for test, status in zip(tests, statuses):
+            test["status"] = _STATUS_LABELS[status]
+        
+        logger.info("Normalized %d tests with pattern extractor (LLM skipped)", len(tests))
+        return {
+            "tests": tests,
+            "normalization_confidence": 0.95
+        }
+    
+    def _has_unresolved_result(self, main_clause: str, matches: List["re.Match"]) -> bool:
+        """Whether anything left after the matched results still looks like a result."""
+        remainder = list(main_clause)
+        for match in matches:
+            remainder[match.start():match.end()] = " " * (match.end() - match.start())
+        remainder = "".join(remainder)
+        
+        # A value with an unsupported unit, or a known test whose value didn't parse
+        # (e.g. "Glucose: 285 H mg/dL")
+        if _UNIT_LIKE_RE.search(remainder):
+            return True
+        name = _KNOWN_TEST_RE.search(remainder)
+        return name is not None and any(char.isdigit() for char in remainder[name.end():])
+    
+    def _build_test(self, match: "re.Match", line: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Turn a regex match into a normalized test (status filled in later), or None if the test/unit/range is unknown."""
+        name = " ".join(match.group("name").split()).casefold()
+        canonical = _TEST_SYNONYMS.get(name)
+        if canonical is None:
+            return None
+        
+        unit, low, high = _REFERENCE_RANGES[canonical]
+        found_unit = _UNIT_ALIASES.get(match.group("unit").casefold(), match.group("unit"))
+        if found_unit.casefold() != unit.casefold():
+            return None
+        
+        # Prefer the reference range printed in the report, if any
+        if line is not None:
+            range_match = _REFERENCE_RANGE_RE.search(line)
+            if range_match and range_match.group("low"):
+                low = float(range_match.group("low").replace(",", ""))
+                high = float(range_match.group("high").replace(",", ""))
+            elif range_match:
+                low, high = 0.0, float(range_match.group("below").replace(",", ""))
+        
+        # No safe default range; let the LLM read the report
+        if low is None:
+            return None
+        
+        return {
+            "name": canonical,
+            "value": float(match.group("value").replace(",", "")),
+            "unit": unit,
+            "status": None,
+            "ref_range": {
+                "low": float(low),
+                "high": float(high)
+            }
+        }
+    
+    def _clean_result(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Validate the structure of an LLM normalization result and drop incomplete tests."""
+        # Validate response structure
+        if "tests" not in result:
+            raise Exception("LLM response missing 'tests' field")
+        
+        if "normalization_confidence" not in result:
+            result["normalization_confidence"] = 0.8
+        
+        # Basic validation and data cleaning
+        if not result["tests"]:
+            logger.warning("No tests extracted by LLM")
+            result["tests"] = []
+        else:
+            # Filter out incomplete tests that have None values
+            cleaned_tests = []
+            for test in result["tests"]:
+                # Check if all required fields are present and not None
+                if (test.get("name") and 
+                    test.get("value") is not None and 
+                    test.get("unit") and 
+                    test.get("status") and 
+                    test.get("ref_range") and
+                    test.get("ref_range", {}).get("low") is not None and
+                    test.get("ref_range", {}).get("high") is not None):
+                    cleaned_tests.append(test)
+                else:
+                    logger.warning("Skipping incomplete test: %s", test)
+            
+            result["tests"] = cleaned_tests
+            logger.info("Filtered to %d complete tests from %d total", len(cleaned_tests), len(result["tests"]))
+        
+        logger.info("Normalized %d tests", len(result["tests"]))
+        return result
+    
+    def _create_normalization_prompt(self, raw_text: str) -> str:
+        """Create the per-report user prompt; instructions live in NORMALIZATION_SYSTEM_PROMPT."""
+        return f"""INPUT TEXT:
+{raw_text}
 
 Extract tests from the input text using your medical knowledge. Return ONLY the JSON object. No other text."""
+    
+    def _create_batch_normalization_prompt(self, raw_texts: List[str]) -> str:
+        """Create the multi-report user prompt; instructions live in BATCH_NORMALIZATION_SYSTEM_PROMPT."""
+        reports = "\n\n".join(
+            f"REPORT {report_id}:\n{raw_text}" for report_id, raw_text in enumerate(raw_texts, 1)
+        )
+        
+        return f"""The input contains {len(raw_texts)} SEPARATE medical reports.
+
+INPUT REPORTS:
+{reports}
+
+Extract tests from every report using your medical knowledge. Return ONLY the JSON object. No other text."""
+
+
+class BatchingNormalizer:
+    """Coalesces concurrent normalization requests into batched LLM calls."""
+    
+    def __init__(self, normalizer: NormalizerService):
+        self.normalizer = normalizer
+        self.max_batch = max(1, settings.NORMALIZE_MAX_BATCH)
+        self.batch_wait = settings.NORMALIZE_BATCH_WAIT_MS / 1000.0
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._running_batches = set()
+    
+    def start(self):
+        """Start the background batching loop on the running event loop."""
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._process_loop())
+    
+    async def stop(self):
+        """Stop the batching loop."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+    
+    async def submit(self, raw_text: str) -> Dict[str, Any]:
+        """Queue a report for normalization and wait for its result."""
+        if self._worker is None:
+            # Batching loop not running (e.g. service used outside the app)
+            return await asyncio.to_thread(self.normalizer.normalize_tests, raw_text)
+        
+        # Reports the pattern extractor handles never wait for a batch
+        result = await asyncio.to_thread(self.normalizer._extract_with_patterns, raw_text)
+        if result is not None:
+            return result
+        
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((raw_text, future))
+        return await future
+    
+    async def _process_loop(self):
+        """
+        Collect up to max_batch reports or wait batch_wait seconds, then normalize them together.
+        
+        A report that would push the batch past the LLM token budget starts the next batch.
+        """
+        loop = asyncio.get_running_loop()
+        carried = None
+        while True:
+            batch = [carried if carried is not None else await self._queue.get()]
+            carried = None
+            deadline = loop.time() + self.batch_wait
+            
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if not self.normalizer._fits_batch_budget([raw_text for raw_text, _ in batch + [item]]):
+                    carried = item
+                    break
+                batch.append(item)
+            
+            # Run the batch in the background so the next one can start collecting
+            task = asyncio.create_task(self._run_batch(batch))
+            self._running_batches.add(task)
+            task.add_done_callback(self._running_batches.discard)
+    
+    async def _run_batch(self, batch: List[tuple]):
+        """Normalize a batch of queued reports with the LLM and resolve each caller's future."""
+        # Drop callers that went away while waiting
+        batch = [(raw_text, future) for raw_text, future in batch if not future.done()]
+        if not batch:
+            return
+        
+        if len(batch) > 1:
+            logger.info("Normalizing batch of %d reports", len(batch))
+        
+        try:
+            results = await asyncio.to_thread(
+                self.normalizer._normalize_batch_with_llm,
+                [raw_text for raw_text, _ in batch]
+            )
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
 
 
 # ============================================================================
 # VALIDATOR SERVICE
 # ============================================================================
 
+class ValidationResponseError(Exception):
+    """The LLM answered, but its validation verdict is malformed."""
+
+
+# Instruction blocks shared by the validation, fused and summary system prompts
+_VALIDATION_CRITERIA = """VALIDATION CRITERIA:
+1. Test Name Verification: Does the test name (or abbreviation) appear in original text?
+2. Value Verification: Does the numeric value appear near the test name?
+3. Medical Accuracy: Is this a real medical test with reasonable values?
+4. OCR Error Tolerance: Account for common OCR errors (O→0, l→1, I→1, etc.)"""
+
+_CONFIDENCE_SCALE = """For each test, score confidence (0.0-1.0) based on:
+- 1.0: Perfect match with clear evidence
+- 0.8-0.9: Good match with minor OCR errors
+- 0.6-0.7: Reasonable match with some uncertainty
+- 0.3-0.5: Weak evidence, possible hallucination
+- 0.0-0.2: No evidence, likely fabricated"""
+
+_MEDICAL_ABBREVIATIONS = (
+    "Acceptable abbreviations: Hb/Hgb=Hemoglobin, WBC=White Blood Cells, RBC=Red Blood Cells, "
+    "Plt=Platelets, Gluc=Glucose, Chol=Cholesterol, Creat=Creatinine, "
+    "ALT/SGPT=Alanine Aminotransferase, AST/SGOT=Aspartate Aminotransferase"
+)
+
+_DECISION_RULES = (
+    'Decision rules: all tests confidence ≥ 0.6 → status "ok"; any test confidence < 0.4 → '
+    'status "unprocessed"; overall confidence = mean of test confidences'
+)
+
+_SUMMARY_GUIDELINES = """IMPORTANT GUIDELINES:
+1. Use simple, everyday language
+2. Focus on what the results mean, not medical diagnoses
+3. Be empathetic and non-alarming
+4. Only explain tests that are provided in the input
+5. DO NOT add information about tests not in the input
+6. For abnormal results (low/high), provide gentle context
+7. Avoid medical jargon
+8. Do not provide treatment recommendations
+9. Encourage consulting with healthcare provider"""
+
+_SUMMARY_TASK = """YOUR TASK:
+1. Create a brief overall summary (1-2 sentences) highlighting any abnormal findings
+2. For each test with abnormal status (low/high), provide a simple explanation
+3. Do not explain normal tests unless particularly relevant"""
+
+
+# JSON schemas passed to Ollama's structured outputs; mirror ValidationResponse / SummaryResponse
+_VALIDATION_STATUS_SCHEMA = {"type": "string", "enum": ["ok", "unprocessed"]}
+
+VALIDATION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "status": _VALIDATION_STATUS_SCHEMA,
+        "reason": {"type": ["string", "null"]},
+        "confidence": {"type": "number", "minimum": 0.0, "maximum": 1.0},
+        "test_validations": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "test_name": {"type": "string"},
+                    "is_valid": {"type": "boolean"},
+                    "confidence": {"type": "number", "minimum": 0.0, "maximum": 1.0},
+                    "evidence": {"type": "string"}
+                },
+                "required": ["test_name", "is_valid", "confidence", "evidence"]
+            }
+        }
+    },
+    "required": ["status", "reason", "confidence", "test_validations"]
+}
+
+BATCH_VALIDATION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "reports": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "report_id": {"type": "integer"},
+                    "status": _VALIDATION_STATUS_SCHEMA,
+                    "reason": {"type": ["string", "null"]},
+                    "confidence": {"type": "number", "minimum": 0.0, "maximum": 1.0}
+                },
+                "required": ["report_id", "status", "reason", "confidence"]
+            }
+        }
+    },
+    "required": ["reports"]
+}
+
+SUMMARY_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "summary": {"type": "string"},
+        "explanations": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "text": {"type": "string"},
+                    "test_name": {"type": "string"}
+                },
+                "required": ["text", "test_name"]
+            }
+        },
+        "status": {"type": "string", "enum": ["ok"]}
+    },
+    "required": ["summary", "explanations", "status"]
+}
+
+FUSED_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "validation": VALIDATION_SCHEMA,
+        "summary": SUMMARY_SCHEMA["properties"]["summary"],
+        "explanations": SUMMARY_SCHEMA["properties"]["explanations"]
+    },
+    "required": ["validation", "summary", "explanations"]
+}
+
+# Canonical test name -> every spelling the normalizer accepts, for locating tests in the text
+_TEST_ALIASES: Dict[str, List[str]] = defaultdict(list)
+for _synonym, _canonical in _TEST_SYNONYMS.items():
+    _TEST_ALIASES[_canonical.casefold()].append(_synonym)
+
+_WINDOW_SEPARATOR = "\n...[SKIP]...\n"
+
+# Number-like tokens, including ones where OCR swapped digits for look-alike letters
+_OCR_NUMBER_RE = re.compile(r"[\dOolI.,]*\d[\dOolI.,]*")
+_OCR_DIGIT_FIXES = str.maketrans({"O": "0", "o": "0", "l": "1", "I": "1"})
+
+
+class _RateLimiter:
+    """Spaces out calls to at most `per_minute` per minute (0 disables); safe across threads and event loops."""
+    
+    def __init__(self, per_minute: int):
+        self.interval = 60.0 / per_minute if per_minute > 0 else 0.0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+    
+    async def acquire(self):
+        """Wait for the next free slot."""
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+class LocalValidator:
+    """
+    Deterministic hallucination check: every test's value must be labelled with its name in the text.
+    
+    Handles the common case without an LLM call. Returns None whenever any test
+    can't be confirmed so the caller falls back to LLM validation.
+    """
+    
+    def __init__(self):
+        self.window = settings.LOCAL_VALIDATION_WINDOW_CHARS
+        self.min_score = settings.LOCAL_VALIDATION_MIN_SCORE
+    
+    def validate(self, original_text: str, extracted_tests: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Return an "ok" validation result if every test is confirmed, else None."""
+        numbers = self._find_numbers(original_text)
+        
+        scores = []
+        for test in extracted_tests:
+            score = self._score_test(original_text, numbers, test)
+            if score < self.min_score:
+                logger.info("Local validation could not confirm '%s' (score %.2f)", test.get("name"), score)
+                return None
+            scores.append(score)
+        
+        return {
+            "status": "ok",
+            "reason": None,
+            "confidence": sum(scores) / len(scores),
+            "tests": extracted_tests
+        }
+    
+    def _find_numbers(self, text: str) -> List[Tuple[float, int, int]]:
+        """Parse every number in the text as (value, start, end), undoing common OCR digit errors."""
+        numbers = []
+        for match in _OCR_NUMBER_RE.finditer(text):
+            # Digits glued to a word ("A1c", OCR'd "Hemog1obin") are part of a label, not a value
+            if match.start() > 0 and text[match.start() - 1].isalpha():
+                continue
+            token = match.group().translate(_OCR_DIGIT_FIXES).replace(",", "").strip(".")
+            try:
+                numbers.append((float(token), match.start(), match.end()))
+            except ValueError:
+                continue
+        return numbers
+    
+    def _score_test(self, text: str, numbers: List[Tuple[float, int, int]], test: Dict[str, Any]) -> float:
+        """
+        Score how well the text supports the test's value being labelled with the test's name.
+        
+        An occurrence of the value only counts when the nearest test name before it on
+        the same line is this test (by any known alias, matched as a whole word), no
+        other number sits between that name and the value, and the gap is at most
+        LOCAL_VALIDATION_WINDOW_CHARS. When no known name precedes the value, the full
+        test name is fuzzy-matched against the label to tolerate OCR errors.
+        """
+        try:
+            value = float(test["value"])
+        except (KeyError, TypeError, ValueError):
+            return 0.0
+        
+        name = " ".join(str(test.get("name", "")).split())
+        if not name:
+            return 0.0
+        canonical = _TEST_SYNONYMS.get(name.casefold())
+        # Tests missing from the synonym table can only be recognised by their own name
+        own_name_re = None if canonical else re.compile(r"\b" + re.escape(name) + r"\b", re.IGNORECASE)
+        
+        best = 0.0
+        for number, start, _ in numbers:
+            if abs(number - value) > 1e-6 * max(1.0, abs(value)):
+                continue
+            line_start = text.rfind("\n", 0, start) + 1
+            
+            # (end, is_this_test) for every test name between the line start and the value
+            mentions = [
+                (match.end(), _TEST_SYNONYMS.get(" ".join(match.group().split()).casefold()) == canonical)
+                for match in _KNOWN_TEST_RE.finditer(text, line_start, start)
+            ]
+            if own_name_re is not None:
+                mentions.extend((match.end(), True) for match in own_name_re.finditer(text, line_start, start))
+            
+            if mentions:
+                label_end = max(end for end, _ in mentions)
+                is_this_test = any(ours for end, ours in mentions if end == label_end)
+                # The value belongs to whichever test is named closest before it
+                if (is_this_test and start - label_end <= self.window and
+                        not any(label_end <= other < start for _, other, _ in numbers)):
+                    return 1.0
+                continue
+            
+            # No recognisable name: fuzzy-match the full name against the label text
+            # after the previous number on this line
+            label_start = max(
+                [line_start, start - self.window - len(name)] +
+                [other_end for _, other_start, other_end in numbers if line_start <= other_start and other_end <= start]
+            )
+            best = max(best, self._fuzzy_ratio((canonical or name).casefold(), text[label_start:start].casefold()))
+        return best
+    
+    def _fuzzy_ratio(self, needle: str, haystack: str) -> float:
+        """Similarity of the needle to its best-matching same-length slice of the haystack."""
+        # Short names match almost anything fuzzily
+        if len(needle) < 4:
+            return 0.0
+        if len(haystack) <= len(needle):
+            return difflib.SequenceMatcher(None, needle, haystack).ratio()
+        
+        # SequenceMatcher caches analysis of its second sequence, so the needle goes there
+        matcher = difflib.SequenceMatcher(None, b=needle)
+        best = 0.0
+        for offset in range(len(haystack) - len(needle) + 1):
+            matcher.set_seq1(haystack[offset:offset + len(needle)])
+            best = max(best, matcher.ratio())
+        return best
+
+
+# Fixed pieces of the per-call user prompts, joined around the variable inputs
+_VALIDATION_PROMPT_HEAD = "ORIGINAL TEXT:\n"
+_VALIDATION_PROMPT_MID = "\n\nEXTRACTED TESTS TO VALIDATE:\n"
+_VALIDATION_PROMPT_TAIL = "\n\nValidate each test and return only valid JSON."
+_FUSED_PROMPT_MID = "\n\nEXTRACTED TESTS:\n"
+_FUSED_PROMPT_TAIL = "\n\nValidate each test, then summarize, and return only valid JSON."
+_BATCH_VALIDATION_PROMPT_TAIL = "\n\nReturn one entry per report and return only valid JSON."
+
+
 class ValidatorService:
     """Service for validating extracted tests against original text using LLM."""
     
+    # Static system prompts: identical across calls so Ollama can reuse their KV cache
+    VALIDATION_SYSTEM_PROMPT = f"""You are a medical data validation expert. Verify extracted test results against the original text and provide confidence scores.
+
+{_VALIDATION_CRITERIA}
+
+VALIDATION TASK:
+{_CONFIDENCE_SCALE}
+
+{_MEDICAL_ABBREVIATIONS}
+
+{_DECISION_RULES}
+
+Give a reason when status is "unprocessed", and for each test a brief note of the evidence found."""
+    
+    BATCH_VALIDATION_SYSTEM_PROMPT = f"""You are a medical data validation expert. The input contains several SEPARATE medical reports. Verify each report's extracted tests against that report's original text ONLY and provide confidence scores.
+
+{_VALIDATION_CRITERIA}
+
+{_CONFIDENCE_SCALE}
+
+{_MEDICAL_ABBREVIATIONS}
+
+{_DECISION_RULES}
+
+Return one entry per report, identified by its report number, with a reason when status is "unprocessed"."""
+    
+    FUSED_SYSTEM_PROMPT = f"""You are a medical data validation and patient communication expert. You have TWO tasks: first verify extracted test results against the original text, then explain the validated results in patient-friendly language without providing medical diagnoses.
+
+TASK 1 - VALIDATION
+{_VALIDATION_CRITERIA}
+
+{_CONFIDENCE_SCALE}
+
+{_MEDICAL_ABBREVIATIONS}
+
+{_DECISION_RULES}
+
+TASK 2 - PATIENT SUMMARY (only if validation status is "ok")
+{_SUMMARY_GUIDELINES}
+
+{_SUMMARY_TASK}
+
+If validation status is "unprocessed", set "summary" to "" and "explanations" to []."""
+    
     def __init__(self):
-        self.llm = LLMService()
+        self.llm = get_llm()
         self.confidence_threshold = settings.VALIDATION_CONFIDENCE_THRESHOLD
+        self.max_batch = max(1, settings.VALIDATE_MAX_BATCH)
+        self.max_concurrency = max(1, settings.VALIDATE_MAX_CONCURRENCY)
+        self.rate_limiter = _RateLimiter(settings.VALIDATE_REQUESTS_PER_MINUTE)
+        self.window_chars = settings.VALIDATION_WINDOW_CHARS
+        self.local_validator = LocalValidator() if settings.LOCAL_VALIDATION_ENABLED else None
     
     def validate_extraction(self, original_text: str, extracted_tests: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Validate that extracted tests are present in original text using LLM."""
+        """Validate that extracted tests are present in original text, using the LLM only when local matching is inconclusive."""
         try:
             if not extracted_tests:
-                return {
-                    "status": "unprocessed",
-                    "reason": "No tests extracted from input",
-                    "confidence": 0.0
-                }
+                return self._no_tests_response()
             
-            prompt = self._create_validation_prompt(original_text, extracted_tests)
+            local_result = self._validate_locally(original_text, extracted_tests)
+            if local_result is not None:
+                return local_result
             
-            logger.info("Calling LLM for hallucination validation")
-            result = self.llm.generate_json(prompt)
+            return self._validate_with_llm(original_text, extracted_tests)
             
-            if "status" not in result:
-                raise Exception("LLM validation response missing 'status' field")
+        except ValidationResponseError as e:
+            # A malformed verdict is final; LLM/transport failures propagate to the caller
+            logger.error("Validation failed: %s", e)
+            return self._error_response(e)
+    
+    def _validate_with_llm(self, original_text: str, extracted_tests: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Ask the LLM for a validation-only verdict."""
+        # The canonical tests JSON is serialized once and reused for the prompt and cache key
+        tests_json = _canonical_tests(extracted_tests)
+        prompt = self._create_validation_prompt(
+            self._window_text(original_text, extracted_tests), extracted_tests, tests_json
+        )
+        
+        logger.info("Calling LLM for hallucination validation")
+        # Reports that differ only in whitespace/case or test order share one cached verdict
+        result = self.llm.generate_json(
+            prompt,
+            schema=VALIDATION_SCHEMA,
+            system=self.VALIDATION_SYSTEM_PROMPT,
+            cache_input=(_canonical_text(original_text), tests_json)
+        )
+        
+        return self._build_validation_response(result, extracted_tests)
+    
+    async def avalidate_extraction(self, original_text: str, extracted_tests: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Awaitable validate_extraction for running alongside other LLM calls."""
+        return await asyncio.to_thread(self.validate_extraction, original_text, extracted_tests)
+    
+    def validate_and_summarize(
+        self,
+        original_text: str,
+        extracted_tests: List[Dict[str, Any]]
+    ) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+        """
+        Validate extracted tests and generate the patient summary in a single LLM call.
+        
+        Returns (validation_result, summary_result) in the same shapes as
+        validate_extraction and SummarizerService.generate_summary. Results a summary
+        template covers only need a validation-only LLM call. summary_result is None
+        when validation fails or no summary could be produced here (local pass without
+        a template, or the LLM omitted it); callers should then use SummarizerService.
+        """
+        try:
+            if not extracted_tests:
+                return self._no_tests_response(), None
             
-            if result["status"] == "unprocessed":
-                logger.warning(f"Validation failed: {result.get('reason', 'Unknown reason')}")
-            else:
-                logger.info("Validation passed - no hallucinations detected")
+            template_summary = _summarize_from_template(extracted_tests)
             
-            # Return validation result with original tests preserved
-            validation_response = {
-                "status": result["status"],
-                "reason": result.get("reason"),
-                "confidence": result.get("confidence", 0.0)
-            }
+            # A local pass needs no validation call; callers summarize separately
+            # unless a template already covers the results
+            local_result = self._validate_locally(original_text, extracted_tests)
+            if local_result is not None:
+                return local_result, template_summary
             
-            # Only include tests if validation passed
-            if result["status"] == "ok":
-                validation_response["tests"] = extracted_tests
+            if template_summary is not None:
+                validation_response = self._validate_with_llm(original_text, extracted_tests)
+                if validation_response["status"] != "ok":
+                    return validation_response, None
+                logger.info("Generated summary from template")
+                return validation_response, template_summary
             
-            return validation_response
+            tests_json = _canonical_tests(extracted_tests)
+            prompt = self._create_fused_prompt(
+                self._window_text(original_text, extracted_tests), extracted_tests, tests_json
+            )
             
-        except Exception as e:
-            logger.error(f"Validation failed: {str(e)}")
-            return {
-                "status": "unprocessed",
-                "reason": f"Validation error: {str(e)}",
-                "confidence": 0.0
+            logger.info("Calling LLM for fused validation and summary")
+            result = self.llm.generate_json(
+                prompt,
+                schema=FUSED_SCHEMA,
+                system=self.FUSED_SYSTEM_PROMPT,
+                cache_input=(_canonical_text(original_text), tests_json)
+            )
+            
+            validation = result.get("validation")
+            if not isinstance(validation, dict):
+                raise ValidationResponseError("LLM response missing 'validation' field")
+            validation_response = self._build_validation_response(validation, extracted_tests)
+            
+            summary_result = None
+            if (validation_response["status"] == "ok" and
+                    result.get("summary") and isinstance(result.get("explanations"), list)):
+                summary_result = {
+                    "summary": result["summary"],
+                    "explanations": result["explanations"],
+                    "status": "ok"
+                }
+                logger.info("Generated summary with %d explanations", len(summary_result["explanations"]))
+            
+            return validation_response, summary_result
+            
+        except ValidationResponseError as e:
+            logger.error("Validation failed: %s", e)
+            return self._error_response(e), None
+    
+    def validate_extraction_batch(
+        self,
+        items: List[Tuple[str, List[Dict[str, Any]]]]
+    ) -> List[Dict[str, Any]]:
+        """Validate several (original_text, extracted_tests) pairs, packing up to VALIDATE_MAX_BATCH reports per LLM call."""
+        results: List[Optional[Dict[str, Any]]] = [
+            self._validate_locally(original_text, extracted_tests) if extracted_tests else self._no_tests_response()
+            for original_text, extracted_tests in items
+        ]
+        pending = [index for index, result in enumerate(results) if result is None]
+        
+        # Latency grows super-linearly with prompt size, so keep batches small
+        for start in range(0, len(pending), self.max_batch):
+            chunk = pending[start:start + self.max_batch]
+            if len(chunk) == 1:
+                index = chunk[0]
+                results[index] = self.validate_extraction(*items[index])
+                continue
+            
+            batch_results = self._validate_batch_with_llm([items[index] for index in chunk])
+            for index, result in zip(chunk, batch_results):
+                results[index] = result
+        return results
+    
+    async def validate_many(self, items: List[Tuple[str, List[Dict[str, Any]]]]) -> List[Dict[str, Any]]:
+        """
+        Validate many reports concurrently, preserving input order.
+        
+        Reports are grouped into VALIDATE_MAX_BATCH-sized batches; up to
+        VALIDATE_MAX_CONCURRENCY batches run at once, started no faster than
+        VALIDATE_REQUESTS_PER_MINUTE.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        async def run_batch(batch: List[Tuple[str, List[Dict[str, Any]]]]) -> List[Dict[str, Any]]:
+            async with semaphore:
+                await self.rate_limiter.acquire()
+                return await asyncio.to_thread(self.validate_extraction_batch, batch)
+        
+        batches = [items[start:start + self.max_batch] for start in range(0, len(items), self.max_batch)]
+        batch_results = await asyncio.gather(*(run_batch(batch) for batch in batches))
+        return [result for results in batch_results for result in results]
+    
+    def _validate_batch_with_llm(self, items: List[Tuple[str, List[Dict[str, Any]]]]) -> List[Dict[str, Any]]:
+        """Validate several reports with one multi-report LLM prompt."""
+        try:
+            prompt = self._create_batch_validation_prompt(items)
+            
+            logger.info("Calling LLM for batched validation of %d reports", len(items))
+            result = self.llm.generate_json(
+                prompt,
+                schema=BATCH_VALIDATION_SCHEMA,
+                system=self.BATCH_VALIDATION_SYSTEM_PROMPT
+            )
+            
+            if "reports" not in result:
+                raise Exception("LLM response missing 'reports' field")
+            reports = {
+                str(report.get("report_id")): report
+                for report in result["reports"]
+                if isinstance(report, dict)
             }
+        except LLMTransientError:
+            # Retries are exhausted; per-report calls would only repeat them for every report
+            raise
+        except Exception as e:
+            logger.warning("Batched validation failed, falling back to per-report calls: %s", e)
+            reports = {}
+        
+        results = []
+        for report_id, (original_text, extracted_tests) in enumerate(items, 1):
+            report = reports.get(str(report_id))
+            if report is not None and "status" in report:
+                results.append(self._build_validation_response(report, extracted_tests))
+            else:
+                # Demultiplexing failed for this report; validate it on its own
+                results.append(self.validate_extraction(original_text, extracted_tests))
+        return results
+    
+    def _validate_locally(self, original_text: str, extracted_tests: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Run the local validator; None means the LLM must decide."""
+        if self.local_validator is None:
+            return None
+        
+        result = self.local_validator.validate(original_text, extracted_tests)
+        if result is not None:
+            logger.info("Validation passed locally - every test found next to its value")
+        return result
+    
+    def _build_validation_response(self, result: Dict[str, Any], extracted_tests: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Turn the LLM's validation verdict into the response returned to callers."""
+        try:
+            status = result["status"]
+        except KeyError:
+            raise ValidationResponseError("LLM validation response missing 'status' field")
+        reason = result.get("reason")
+        
+        if status == "unprocessed":
+            logger.warning("Validation failed: %s", reason or "Unknown reason")
+        else:
+            logger.info("Validation passed - no hallucinations detected")
+        
+        # Return validation result with original tests preserved
+        validation_response = {
+            "status": status,
+            "reason": reason,
+            "confidence": result.get("confidence", 0.0)
+        }
+        
+        # Only include tests if validation passed
+        if status == "ok":
+            validation_response["tests"] = extracted_tests
+        
+        return validation_response
+    
+    def _no_tests_response(self) -> Dict[str, Any]:
+        """Validation result for an empty extraction."""
+        return {
+            "status": "unprocessed",
+            "reason": "No tests extracted from input",
+            "confidence": 0.0
+        }
+    
+    def _error_response(self, error: Exception) -> Dict[str, Any]:
+        """Validation result for a failed validation call."""
+        return {
+            "status": "unprocessed",
+            "reason": f"Validation error: {str(error)}",
+            "confidence": 0.0
+        }
+    
+    def _window_text(self, original_text: str, extracted_tests: List[Dict[str, Any]]) -> str:
+        """
+        Cut the original text down to the regions around each extracted test name.
+        
+        Long OCR dumps usually hold the results in a few lines, and prompt prefill
+        grows with every token sent. Returns the full text when windowing is disabled,
+        wouldn't shrink it, or any test name can't be located (the LLM must then see
+        everything to judge whether that test was hallucinated).
+        """
+        if self.window_chars <= 0 or len(original_text) <= 2 * self.window_chars:
+            return original_text
+        
+        spans = []
+        for test in extracted_tests:
+            name = str(test.get("name", "")).casefold()
+            terms = {name, *_TEST_ALIASES.get(name, [])} - {""}
+            if not terms:
+                return original_text
+            pattern = r"\b(?:" + "|".join(re.escape(term) for term in sorted(terms, key=len, reverse=True)) + r")\b"
+            matches = [
+                (max(0, match.start() - self.window_chars), match.end() + self.window_chars)
+                for match in re.finditer(pattern, original_text, re.IGNORECASE)
+            ]
+            if not matches:
+                return original_text
+            spans.extend(matches)
+        
+        # Merge overlapping windows so shared context is sent once
+        spans.sort()
+        merged = [list(spans[0])]
+        for start, end in spans[1:]:
+            if start <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+        
+        windowed = _WINDOW_SEPARATOR.join(original_text[start:end] for start, end in merged)
+        return windowed if len(windowed) < len(original_text) else original_text
+    
+    def _create_validation_prompt(
+        self,
+        original_text: str,
+        extracted_tests: List[Dict[str, Any]],
+        tests_json: Optional[str] = None
+    ) -> str:
+        """Create the validation user prompt; the rubric lives in VALIDATION_SYSTEM_PROMPT."""
+        if tests_json is None:
+            tests_json = _to_json(extracted_tests)
+        
+        return "".join((
+            _VALIDATION_PROMPT_HEAD, original_text, _VALIDATION_PROMPT_MID, tests_json, _VALIDATION_PROMPT_TAIL
+        ))
     
-    def _create_validation_prompt(self, original_text: str, extracted_tests: List[Dict[str, Any]]) -> str:
-        """Create enhanced validation prompt with confidence scoring."""
-        tests_json = json.dumps(extracted_tests, indent=2)
+    def _create_batch_validation_prompt(self, items: List[Tuple[str, List[Dict[str, Any]]]]) -> str:
+        """Create the multi-report user prompt; the rubric lives in BATCH_VALIDATION_SYSTEM_PROMPT."""
+        parts = [f"The input contains {len(items)} SEPARATE medical reports.\n\nINPUT REPORTS:"]
+        for report_id, (original_text, extracted_tests) in enumerate(items, 1):
+            parts.extend((
+                f"\n\nREPORT_{report_id}:\n", self._window_text(original_text, extracted_tests),
+                f"\n\nTESTS_{report_id}:\n", _to_json(extracted_tests)
+            ))
+        parts.append(_BATCH_VALIDATION_PROMPT_TAIL)
         
-        return f"""You are a medical data validation expert. Verify extracted test results against the original text and provide confidence scores.
+        return "".join(parts)
+    
+    def _create_fused_prompt(
+        self,
+        original_text: str,
+        extracted_tests: List[Dict[str, Any]],
+        tests_json: Optional[str] = None
+    ) -> str:
+        """Create the fused user prompt; both rubrics live in FUSED_SYSTEM_PROMPT."""
+        if tests_json is None:
+            tests_json = _to_json(extracted_tests)
+        
+        return "".join((
+            _VALIDATION_PROMPT_HEAD, original_text, _FUSED_PROMPT_MID, tests_json, _FUSED_PROMPT_TAIL
+        ))
 
-VALIDATION CRITERIA:
-1. Test Name Verification: Does the test name (or abbreviation) appear in original text?
-2. Value Verification: Does the numeric value appear near the test name?
-3. Medical Accuracy: Is this a real medical test with reasonable values?
-4. OCR Error Tolerance: Account for common OCR errors (O→0, l→1, I→1, etc.)
 
-ORIGINAL TEXT:
-{original_text}
+# ============================================================================
+# SUMMARIZER SERVICE
+# ============================================================================
 
-EXTRACTED TESTS TO VALIDATE:
-{tests_json}
+# Fixed pieces of the summary user prompt, joined around the tests JSON
+_SUMMARY_PROMPT_HEAD = "NORMALIZED TEST RESULTS:\n"
+_SUMMARY_PROMPT_TAIL = "\n\nNow generate the patient-friendly summary. Return only valid JSON."
 
-VALIDATION TASK:
-For each test, score confidence (0.0-1.0) based on:
-- 1.0: Perfect match with clear evidence
-- 0.8-0.9: Good match with minor OCR errors
-- 0.6-0.7: Reasonable match with some uncertainty
-- 0.3-0.5: Weak evidence, possible hallucination
-- 0.0-0.2: No evidence, likely fabricated
-
-MEDICAL ABBREVIATIONS (acceptable):
-- Hb, Hgb → Hemoglobin
-- WBC → White Blood Cells
-- RBC → Red Blood Cells
-- Plt → Platelets
-- Gluc → Glucose
-- Chol → Cholesterol
-- Creat → Creatinine
-- ALT, SGPT → Alanine Aminotransferase
-- AST, SGOT → Aspartate Aminotransferase
-
-RESPONSE FORMAT:
-{{
-  "status": "ok" or "unprocessed",
-  "reason": "explanation if status is unprocessed",
-  "confidence": overall_confidence_0_to_1,
-  "test_validations": [
-    {{
-      "test_name": "exact_name_from_input",
-      "is_valid": true/false,
-      "confidence": 0.0_to_1.0,
-      "evidence": "brief explanation of evidence found"
-    }}
-  ]
-}}
 
-DECISION RULES:
-- If ALL tests have confidence ≥ 0.6: status = "ok"
-- If ANY test has confidence < 0.4: status = "unprocessed"
-- Overall confidence = average of individual test confidences
+_ALL_NORMAL_SUMMARY = "All reported test values are within the normal reference ranges."
+_SINGLE_ABNORMAL_SUMMARY = (
+    "Your {name} result is {direction} than the normal range. All other reported values are "
+    "within their normal reference ranges."
+)
 
-Validate each test and return only valid JSON."""
+# Patient-friendly explanations for common single-abnormal results: (canonical test, status) -> text
+_EXPLANATION_TEMPLATES = {
+    ("Hemoglobin", "low"): "Your hemoglobin is lower than normal, which might make you feel tired or weak. This can be related to anemia. Your doctor can help determine the cause.",
+    ("Hemoglobin", "high"): "Your hemoglobin is higher than normal. This can happen with dehydration or other conditions. Your doctor will help interpret this in context.",
+    ("White Blood Cells", "low"): "Your white blood cell count is lower than normal. These cells help fight infection, so your doctor may want to look into the cause.",
+    ("White Blood Cells", "high"): "Your white blood cell count is higher than normal. This can happen during infections or inflammation. Your doctor will help interpret this in context.",
+    ("Platelets", "low"): "Your platelet count is lower than normal. Platelets help your blood clot, so your doctor may want to check on this.",
+    ("Platelets", "high"): "Your platelet count is higher than normal. This can happen with inflammation or other conditions. Your doctor will help interpret this in context.",
+    ("Glucose", "low"): "Your blood sugar is lower than normal, which can cause shakiness or dizziness. Your doctor can help find out why.",
+    ("Glucose", "high"): "Your blood sugar is higher than normal. This can be affected by recent meals, and your doctor may want to follow up with further testing.",
+    ("Hemoglobin A1c", "high"): "Your HbA1c, which reflects your average blood sugar over the past few months, is higher than normal. Your doctor can explain what this means for you.",
+    ("Creatinine", "high"): "Your creatinine is higher than normal. Creatinine is a waste product filtered by the kidneys, so your doctor may want to check your kidney function.",
+    ("Potassium", "low"): "Your potassium is lower than normal. Potassium helps your muscles and heart work properly, so your doctor may want to follow up.",
+    ("Potassium", "high"): "Your potassium is higher than normal. Potassium helps your muscles and heart work properly, so your doctor may want to follow up.",
+    ("Sodium", "low"): "Your sodium is lower than normal. Sodium helps balance the fluids in your body. Your doctor will help interpret this in context.",
+    ("Sodium", "high"): "Your sodium is higher than normal, which is often related to fluid balance. Your doctor will help interpret this in context.",
+    ("Thyroid Stimulating Hormone", "low"): "Your TSH is lower than normal. TSH controls your thyroid gland, so your doctor may want to check your thyroid function.",
+    ("Thyroid Stimulating Hormone", "high"): "Your TSH is higher than normal. TSH controls your thyroid gland, so your doctor may want to check your thyroid function.",
+    ("Total Cholesterol", "high"): "Your total cholesterol is higher than normal. Your doctor can discuss what this means for your heart health.",
+    ("LDL Cholesterol", "high"): "Your LDL (\"bad\") cholesterol is higher than normal. Your doctor can discuss what this means for your heart health.",
+    ("HDL Cholesterol", "low"): "Your HDL (\"good\") cholesterol is lower than normal. Your doctor can discuss what this means for your heart health.",
+    ("Triglycerides", "high"): "Your triglycerides, a type of fat in the blood, are higher than normal. Your doctor can discuss what this means for you.",
+    ("Vitamin D", "low"): "Your vitamin D is lower than normal. Vitamin D is important for healthy bones, and your doctor can advise on next steps.",
+    ("Vitamin B12", "low"): "Your vitamin B12 is lower than normal. B12 helps keep your nerves and blood cells healthy, and your doctor can advise on next steps.",
+}
 
 
-# ============================================================================
-# SUMMARIZER SERVICE
-# ============================================================================
+def _summarize_from_template(normalized_tests: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Summarize all-normal or single-abnormal results without the LLM; None if a template doesn't cover them."""
+    if not settings.SUMMARY_TEMPLATES_ENABLED:
+        return None
+    
+    abnormal = [test for test in normalized_tests if test.get("status") != "normal"]
+    if not abnormal:
+        return {"summary": _ALL_NORMAL_SUMMARY, "explanations": [], "status": "ok"}
+    if len(abnormal) > 1:
+        return None
+    
+    test = abnormal[0]
+    name = str(test.get("name", ""))
+    canonical = _TEST_SYNONYMS.get(name.casefold(), name)
+    explanation = _EXPLANATION_TEMPLATES.get((canonical, test.get("status")))
+    if explanation is None:
+        return None
+    
+    return {
+        "summary": _SINGLE_ABNORMAL_SUMMARY.format(
+            name=canonical,
+            direction="lower" if test["status"] == "low" else "higher"
+        ),
+        "explanations": [{"text": explanation, "test_name": name}],
+        "status": "ok"
+    }
+
 
 class SummarizerService:
     """Service for generating patient-friendly summaries using LLM."""
     
+    # Static system prompt: identical across calls so Ollama can reuse its KV cache
+    SUMMARY_SYSTEM_PROMPT = f"""You are a medical communication expert. Your task is to create patient-friendly explanations of medical test results without providing medical diagnoses.
+
+{_SUMMARY_GUIDELINES}
+
+{_SUMMARY_TASK}"""
+    
     def __init__(self):
-        self.llm = LLMService()
+        self.llm = get_llm()
     
     def generate_summary(self, normalized_tests: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Generate patient-friendly summary and explanations."""
@@ -418,10 +2059,20 @@ class SummarizerService:
                     "status": "ok"
                 }
             
-            prompt = self._create_summary_prompt(normalized_tests)
+            template_result = _summarize_from_template(normalized_tests)
+            if template_result is not None:
+                logger.info("Generated summary from template")
+                return template_result
+            
+            # Test order doesn't change the summary, so the prompt itself is canonical
+            prompt = self._create_summary_prompt(normalized_tests, _canonical_tests(normalized_tests))
             
             logger.info("Calling LLM for summary generation")
-            result = self.llm.generate_json(prompt)
+            result = self.llm.generate_json(
+                prompt,
+                schema=SUMMARY_SCHEMA,
+                system=self.SUMMARY_SYSTEM_PROMPT
+            )
             
             if "summary" not in result or "explanations" not in result:
                 raise Exception("LLM response missing required fields")
@@ -429,65 +2080,22 @@ class SummarizerService:
             if "status" not in result:
                 result["status"] = "ok"
             
-            logger.info(f"Generated summary with {len(result['explanations'])} explanations")
+            logger.info("Generated summary with %d explanations", len(result["explanations"]))
             return result
             
+        except LLMTransientError:
+            raise
         except Exception as e:
-            logger.error(f"Summary generation failed: {str(e)}")
+            logger.error("Summary generation failed: %s", e)
             raise Exception(f"Summarization failed: {str(e)}")
     
-    def _create_summary_prompt(self, normalized_tests: List[Dict[str, Any]]) -> str:
-        """Create prompt for summary generation."""
-        tests_json = json.dumps(normalized_tests, indent=2)
+    async def agenerate_summary(self, normalized_tests: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Awaitable generate_summary for running alongside other LLM calls."""
+        return await asyncio.to_thread(self.generate_summary, normalized_tests)
+    
+    def _create_summary_prompt(self, normalized_tests: List[Dict[str, Any]], tests_json: Optional[str] = None) -> str:
+        """Create the summary user prompt; instructions live in SUMMARY_SYSTEM_PROMPT."""
+        if tests_json is None:
+            tests_json = _to_json(normalized_tests)
         
-        return f"""You are a medical communication expert. Your task is to create patient-friendly explanations of medical test results without providing medical diagnoses.
-
-IMPORTANT GUIDELINES:
-1. Use simple, everyday language
-2. Focus on what the results mean, not medical diagnoses
-3. Be empathetic and non-alarming
-4. Only explain tests that are provided in the input
-5. DO NOT add information about tests not in the input
-6. For abnormal results (low/high), provide gentle context
-7. Avoid medical jargon
-8. Do not provide treatment recommendations
-9. Encourage consulting with healthcare provider
-
-NORMALIZED TEST RESULTS:
-{tests_json}
-
-YOUR TASK:
-1. Create a brief overall summary (1-2 sentences) highlighting any abnormal findings
-2. For each test with abnormal status (low/high), provide a simple explanation
-3. Do not explain normal tests unless particularly relevant
-
-OUTPUT FORMAT:
-Return a JSON object with this exact structure:
-{{
-  "summary": "Brief overall summary of findings",
-  "explanations": [
-    {{
-      "text": "Simple explanation for patients",
-      "test_name": "Test Name"
-    }}
-  ],
-  "status": "ok"
-}}
-
-EXAMPLE OUTPUT:
-{{
-  "summary": "Your test results show low hemoglobin and high white blood cell count.",
-  "explanations": [
-    {{
-      "text": "Your hemoglobin is lower than normal, which might make you feel tired or weak. This can be related to anemia. Your doctor can help determine the cause.",
-      "test_name": "Hemoglobin"
-    }},
-    {{
-      "text": "Your white blood cell count is slightly higher than normal. This can happen during infections or inflammation. Your doctor will help interpret this in context.",
-      "test_name": "WBC"
-    }}
-  ],
-  "status": "ok"
-}}
-
-Now generate the patient-friendly summary. Return only valid JSON."""
+        return "".join((_SUMMARY_PROMPT_HEAD, tests_json, _SUMMARY_PROMPT_TAIL))
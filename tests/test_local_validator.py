@@ -0,0 +1,44 @@
+from api.services import LocalValidator
+
+
+SWAPPED_TEXT = "Hemoglobin: 8.5 g/dL\nGlucose: 12.0 mg/dL\nWBC: 7,500 /uL"
+
+
+def test_accepts_values_labelled_with_their_test():
+    tests = [
+        {"name": "Hemoglobin", "value": 8.5},
+        {"name": "Glucose", "value": 12.0},
+        {"name": "White Blood Cells", "value": 7500},
+    ]
+    result = LocalValidator().validate(SWAPPED_TEXT, tests)
+    assert result is not None
+    assert result["status"] == "ok"
+
+
+def test_rejects_swapped_values():
+    tests = [
+        {"name": "Hemoglobin", "value": 12.0},
+        {"name": "Glucose", "value": 8.5},
+    ]
+    assert LocalValidator().validate(SWAPPED_TEXT, tests) is None
+
+
+def test_rejects_value_from_another_line():
+    tests = [{"name": "White Blood Cells", "value": 12.0}]
+    assert LocalValidator().validate(SWAPPED_TEXT, tests) is None
+
+
+def test_rejects_alias_inside_a_different_test_name():
+    tests = [{"name": "Creatinine", "value": 150}]
+    assert LocalValidator().validate("Creatine Kinase 150 U/L", tests) is None
+
+
+def test_rejects_reference_range_bound():
+    text = "Hemoglobin: 8.5 g/dL (LOW - Normal: 12.0-15.5)"
+    tests = [{"name": "Hemoglobin", "value": 12.0}]
+    assert LocalValidator().validate(text, tests) is None
+
+
+def test_tolerates_ocr_errors_in_test_name():
+    tests = [{"name": "Hemoglobin", "value": 8.5}]
+    assert LocalValidator().validate("Hemog1obin: 8.5 g/dL", tests) is not None
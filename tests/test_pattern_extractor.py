@@ -0,0 +1,49 @@
+from api.services import NormalizerService
+
+
+def extract(text):
+    return NormalizerService()._extract_with_patterns(text)
+
+
+def test_extracts_supported_units_and_classifies_them():
+    result = extract("Glucose: 285 mg/dL\nWBC: 7,500 /uL\nTSH: 2.1 mIU/L\nHbA1c: 9.8%")
+    assert result is not None
+    statuses = {test["name"]: (test["value"], test["status"]) for test in result["tests"]}
+    assert statuses == {
+        "Glucose": (285.0, "high"),
+        "White Blood Cells": (7500.0, "normal"),
+        "Thyroid Stimulating Hormone": (2.1, "normal"),
+        "Hemoglobin A1c": (9.8, "high"),
+    }
+
+
+def test_unsupported_units_fall_back_to_llm():
+    text = "Glucose: 95 mg/dL\nESR: 45 mm/hr\nMCV: 72 fL\nALT: 120 IU/L\nFerritin: 8 ug/L"
+    assert extract(text) is None
+
+
+def test_flag_between_value_and_unit_falls_back_to_llm():
+    assert extract("Glucose: 285 H mg/dL\nSodium: 140 mEq/L\nPotassium: 4.0 mEq/L") is None
+
+
+def test_flag_after_unit_and_non_result_numbers_are_ignored():
+    text = "Date: 01/15/2024\nGlucose: 285 mg/dL H\nSodium: 140 mEq/L\nPotassium: 4.0 mEq/L\nPage 1 of 2"
+    result = extract(text)
+    assert result is not None
+    assert [test["name"] for test in result["tests"]] == ["Glucose", "Sodium", "Potassium"]
+
+
+def test_printed_range_overrides_default():
+    result = extract("Glucose: 105 mg/dL (Normal: 70-110)\nSodium: 140 mEq/L\nPotassium: 4.0 mEq/L")
+    assert result is not None
+    glucose = result["tests"][0]
+    assert glucose["ref_range"] == {"low": 70.0, "high": 110.0}
+    assert glucose["status"] == "normal"
+
+
+def test_tests_without_default_range_need_a_printed_range():
+    assert extract("HDL: 75 mg/dL\nGlucose: 95 mg/dL\nSodium: 140 mEq/L") is None
+    
+    result = extract("HDL: 75 mg/dL (Normal: 40-100)\nGlucose: 95 mg/dL\nSodium: 140 mEq/L")
+    assert result is not None
+    assert result["tests"][0]["ref_range"] == {"low": 40.0, "high": 100.0}